@@ -0,0 +1,205 @@
+"""End to end GUI latency benchmark.
+
+Runs `grplot.MainWindow` headless on synthetic captures and measures the
+time from changing a setting through the real widgets until the active plot
+has been repainted.
+
+Example:
+    $ python benchmarks/gui_latency.py --samples 2000000 --max_p95 250
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import itertools
+
+# Must be set before Qt is imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy  # type: ignore  # noqa: E402
+import click  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+import grplot  # noqa: E402
+
+_SIGNALS = ['tone', 'chirp', 'noise']
+_SAMPLE_RATES = [8000.0, 48000.0, 250000.0]
+
+
+def write_capture(path, kind, samples, chunk_size=1 << 20):
+    # type: (str, str, int, int) -> None
+    """Write a complex64 synthetic capture in chunks"""
+    rng = numpy.random.RandomState(0)
+    with open(path, 'wb') as capture:
+        for start in range(0, samples, chunk_size):
+            n = numpy.arange(start, min(start + chunk_size, samples),
+                             dtype=numpy.float64)
+            if kind == 'tone':
+                chunk = numpy.exp(2j * numpy.pi * 0.1 * n)
+            elif kind == 'chirp':
+                chunk = numpy.exp(1j * numpy.pi * 0.45 * n * n / samples)
+            else:
+                chunk = rng.randn(len(n)) + 1j * rng.randn(len(n))
+            chunk += 0.01 * (rng.randn(len(n)) + 1j * rng.randn(len(n)))
+            chunk.astype(numpy.complex64).tofile(capture)
+
+
+class LatencyBench(object):
+    """Scripts a MainWindow through its settings widgets"""
+    # pylint: disable=W0212
+    def __init__(self, app, path):
+        self._app = app
+        self.window = grplot.MainWindow(path, 'complex64')
+        self._wait_for_load()
+        self._fft = self.window.settings_widget._fft_settings
+        self._file = self.window.settings_widget._file_info
+        self._plots = self.window.plot_widget
+
+    def _wait_for_load(self):
+        while (self.window._loader is not None and
+               (self.window._loader.isRunning() or
+                self.window._cancel_action.isEnabled())):
+            self._app.processEvents()
+            time.sleep(0.001)
+        self._app.processEvents()
+
+    def _painted(self, start):
+        # type: (float) -> float
+        """Let queued events run and paint the active plot synchronously"""
+        self._app.processEvents()
+        self._plots.tabs.currentWidget().viewport().repaint()
+        return time.perf_counter() - start
+
+    def fft_size(self, idx):
+        start = time.perf_counter()
+        self._fft._size_w.setCurrentIndex(idx % self._fft._size_w.count())
+        return self._painted(start)
+
+    def window_function(self, idx):
+        start = time.perf_counter()
+        self._fft._window_w.setCurrentIndex(
+            idx % self._fft._window_w.count()
+        )
+        return self._painted(start)
+
+    def sample_rate(self, idx):
+        start = time.perf_counter()
+        self._file._sample_rate_w.setValue(
+            _SAMPLE_RATES[idx % len(_SAMPLE_RATES)]
+        )
+        return self._painted(start)
+
+    def tab(self, idx):
+        start = time.perf_counter()
+        self._plots.tabs.setCurrentIndex(idx % self._plots.tabs.count())
+        return self._painted(start)
+
+    def range(self, idx):
+        # There is no range widget yet, this is what one would drive
+        source = self._plots.data_source
+        item_size = numpy.dtype(source.data_type).itemsize
+        length = source.capture.size // item_size
+        span = max(length // 4, 1)
+        offset = (idx % 4) * (length - span) // 3
+        start = time.perf_counter()
+        source.set_range(offset, offset + span)
+        self.window.settings_widget.source_update()
+        self._plots.refresh_plot()
+        return self._painted(start)
+
+
+_ACTIONS = ['fft_size', 'window_function', 'sample_rate', 'tab', 'range']
+
+
+def run(app, path, repeat):
+    # type: (QApplication, str, int) -> dict
+    bench = LatencyBench(app, path)
+    latencies = {action: [] for action in _ACTIONS}
+    tabs = bench.window.plot_widget.tabs.count()
+    # Every action is measured on every tab so the numbers cover all views
+    for idx, tab in itertools.product(range(repeat), range(tabs)):
+        bench.tab(tab)
+        for action in _ACTIONS:
+            if action == 'tab':
+                latencies[action].append(bench.tab(tab + 1))
+                bench.tab(tab)
+            else:
+                latencies[action].append(getattr(bench, action)(idx + 1))
+    bench.window.close()
+    return latencies
+
+
+def percentiles(samples):
+    values = numpy.array(samples) * 1000.0
+    return {
+        'p50': float(numpy.percentile(values, 50)),
+        'p95': float(numpy.percentile(values, 95)),
+        'max': float(values.max()),
+    }
+
+
+@click.command()
+@click.option('--samples', type=int, default=1000000, show_default=True,
+              help='Samples per synthetic capture')
+@click.option('--signal', 'signals', type=click.Choice(_SIGNALS),
+              multiple=True, help='Signals to run, defaults to all')
+@click.option('--repeat', type=int, default=3, show_default=True)
+@click.option('--max_p50', type=float, default=None,
+              help='Fail if any action p50 exceeds this many ms')
+@click.option('--max_p95', type=float, default=None,
+              help='Fail if any action p95 exceeds this many ms')
+@click.option('--thresholds', type=click.Path(exists=True, dir_okay=False),
+              help='JSON of {action: {p50: ms, p95: ms}} limits')
+@click.option('--json', 'json_out', type=click.Path(dir_okay=False),
+              help='Write the results to a JSON file')
+def main(samples, signals, repeat, max_p50, max_p95, thresholds, json_out):
+    """Measure setting change to repaint latency and check thresholds"""
+    limits = {}
+    if thresholds:
+        with open(thresholds) as limits_file:
+            limits = json.load(limits_file)
+    for action in _ACTIONS:
+        limits.setdefault(action, {})
+        if max_p50 is not None:
+            limits[action].setdefault('p50', max_p50)
+        if max_p95 is not None:
+            limits[action].setdefault('p95', max_p95)
+
+    app = QApplication(sys.argv)
+    results = {}
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for kind in signals or _SIGNALS:
+            path = os.path.join(tmp_dir, kind + '.bin')
+            write_capture(path, kind, samples)
+            results[kind] = {
+                action: percentiles(latencies)
+                for action, latencies in run(app, path, repeat).items()
+            }
+            os.remove(path)
+
+    click.echo('{0:<8} {1:<16} {2:>9} {3:>9} {4:>9}'.format(
+        'signal', 'action', 'p50 ms', 'p95 ms', 'max ms'))
+    for kind, actions in results.items():
+        for action, stats in actions.items():
+            click.echo('{0:<8} {1:<16} {2:>9.1f} {3:>9.1f} {4:>9.1f}'.format(
+                kind, action, stats['p50'], stats['p95'], stats['max']))
+            for stat, limit in limits.get(action, {}).items():
+                if stats[stat] > limit:
+                    failures.append('{0} {1} {2} {3:.1f} ms > {4:.1f} ms'
+                                    .format(kind, action, stat,
+                                            stats[stat], limit))
+
+    if json_out:
+        with open(json_out, 'w') as results_file:
+            json.dump(results, results_file, indent=2)
+
+    if failures:
+        for failure in failures:
+            click.echo('REGRESSION: ' + failure, err=True)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=E1120
@@ -6,7 +6,7 @@ Example:
 """
 try:
     from typing import (
-        Optional, Tuple,
+        Any, Callable, Dict, Iterator, List, Optional, Tuple,
     )
 except ImportError:
     # Typing is needed for mypy on python2
@@ -14,28 +14,72 @@ except ImportError:
 
 import sys
 import os
+import bz2
+import copy
+import errno
+import math
+import json
+import lzma
+import zlib
+import struct
+import bisect
+import getpass
+import hashlib
+import fnmatch
 import logging
-from collections import namedtuple, defaultdict
+import sqlite3
+import importlib.util
+from collections import namedtuple, defaultdict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-import pyqtgraph as pg  # type: ignore
 import numpy  # type: ignore
 import click
-from scipy import signal  # type: ignore
-from PyQt5.QtCore import QSize
+from numpy.lib.stride_tricks import sliding_window_view  # type: ignore
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    # zstd compressed captures are optional
+    zstandard = None
+from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
 from PyQt5 import QtGui
-from PyQt5.QtGui import QStyle  # pylint: disable=E0611
+from PyQt5.QtWidgets import QStyle
 from PyQt5.QtGui import (
     QIcon, QColor,
 )
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QLabel, QWidget, QTabWidget, QVBoxLayout,
     QLineEdit, QComboBox, QGridLayout, QFormLayout, qApp, QAction,
-    QFileDialog, QColorDialog, QGroupBox, QDoubleSpinBox, QPushButton
+    QFileDialog, QColorDialog, QGroupBox, QDoubleSpinBox, QPushButton,
+    QSpinBox, QProgressBar, QCheckBox,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _lazy_import(name):
+    # type: (str) -> Any
+    """Import a module on its first attribute access.
+
+    scipy and pyqtgraph take most of the import time, loading them lazily
+    lets `--single_instance` hand a file over before paying for them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+pg = _lazy_import('pyqtgraph')
+signal = _lazy_import('scipy.signal')
+sp_fft = _lazy_import('scipy.fft')
+
+
 # These window functions come from `scipy.signal.windows`.  Some are excluded
 # because they require additional parameters.  Perhaps these could be supported
 # by extending the window function UI to take in the required parameters
@@ -46,13 +90,756 @@ _WINDOW_FUNCTIONS = [
 ]
 
 _DATA_TYPES = [
-    'complex64',
+    'complex64', 'complex128',
     'float32', 'float64',
     'int8', 'int16', 'int32', 'int64',
     'uint8', 'uint16', 'uint32', 'uint64',
 ]
 
 
+def density_histogram(data,  # type: numpy.ndarray
+                      bins=256,  # type: int
+                      extent=None,  # type: Optional[float]
+                      chunk_size=1 << 20,  # type: int
+                      ):
+    # type: (...) -> Tuple[numpy.ndarray, float]
+    """Bin IQ samples into a `bins` x `bins` count image.
+
+    The samples are processed `chunk_size` at a time so the temporaries are
+    bounded by the chunk and not the full data length.  The first axis of the
+    result is the in-phase component and the second is quadrature, both
+    covering [-extent, extent].  If no extent is supplied the largest
+    component magnitude is used.
+    """
+    if extent is None:
+        extent = 0.0
+        for idx in range(0, len(data), chunk_size):
+            chunk = data[idx:idx + chunk_size]
+            extent = max(
+                extent,
+                float(numpy.max(numpy.abs(chunk.real), initial=0.0)),
+                float(numpy.max(numpy.abs(chunk.imag), initial=0.0)),
+            )
+    if extent <= 0.0:
+        # All zero data, any extent works just keep the math valid
+        extent = 1.0
+
+    scale = bins / (2.0 * extent)
+    counts = numpy.zeros(bins * bins, dtype=numpy.int64)
+    for idx in range(0, len(data), chunk_size):
+        chunk = data[idx:idx + chunk_size]
+        i_bins = numpy.floor((chunk.real + extent) * scale).astype(numpy.intp)
+        q_bins = numpy.floor((chunk.imag + extent) * scale).astype(numpy.intp)
+        numpy.clip(i_bins, 0, bins - 1, out=i_bins)
+        numpy.clip(q_bins, 0, bins - 1, out=q_bins)
+        i_bins *= bins
+        i_bins += q_bins
+        counts += numpy.bincount(i_bins, minlength=bins * bins)
+    return counts.reshape(bins, bins), extent
+
+
+def sample_levels(image, percentiles=(1.0, 99.9), samples=1 << 16):
+    # type: (numpy.ndarray, Tuple[float, float], int) -> Tuple[float, float]
+    """Display levels of an image from the `percentiles` of an evenly
+    strided sample of about `samples` of its values, not a full scan"""
+    flat = image.reshape(-1)
+    step = max(1, len(flat) // samples)
+    low, high = numpy.percentile(flat[::step], percentiles)
+    if not high > low:
+        high = low + 1.0
+    return float(low), float(high)
+
+
+def quantize(image, levels, dtype=numpy.uint8, rows=1024):
+    # type: (numpy.ndarray, Tuple[float, float], Any, int) -> numpy.ndarray
+    """Map `levels` of a 2d image to the full range of an integer `dtype`,
+    clipping values outside of them.  `rows` are converted at a time to
+    bound the float temporary"""
+    top = numpy.iinfo(dtype).max
+    low, high = levels
+    scale = top / (high - low)
+    out = numpy.empty(image.shape, dtype)
+    for row in range(0, len(image), rows):
+        block = image[row:row + rows] - low
+        block *= scale
+        numpy.clip(block, 0, top, out=block)
+        # Round to the nearest level rather than truncating
+        block += 0.5
+        out[row:row + rows] = block
+    return out
+
+
+# Rough peak bytes per sample shown on the time plot: the float64 time axis
+# and pyqtgraph's float64 copies of I and Q
+_PLOT_BYTES_PER_SAMPLE = 24
+# Rough peak bytes per STFT bin of a working block: the complex64 frames, the
+# complex64 FFT output and the float32 power
+_STFT_BYTES_PER_BIN = 20
+# Largest working block of the STFT even without a budget, so the peak memory
+# stays close to the output image
+_STFT_BLOCK_BYTES = 1 << 22
+# Rough peak bytes per input sample of a streamed chunk: the raw read, the
+# shifted copy, the filter input and the complex128 filter output
+_STREAM_BYTES_PER_SAMPLE = 48
+
+
+class MemoryBudget(object):
+    """Upper bound on the memory a single view is allowed to allocate.
+
+    The estimates are deliberately rough, they only need to be good enough
+    to pick a chunk size, decimation or frame averaging that keeps grplot
+    from swapping.  A limit of None disables the governor.
+    """
+    def __init__(self, limit=None):
+        # type: (Optional[int]) -> None
+        self.limit = limit
+
+    def fits(self, nbytes):
+        # type: (int) -> bool
+        return self.limit is None or nbytes <= self.limit
+
+    def reduction(self, nbytes):
+        # type: (int) -> int
+        """Smallest integer factor that brings `nbytes` within the limit"""
+        if self.fits(nbytes):
+            return 1
+        return int(math.ceil(float(nbytes) / self.limit))
+
+    def stft_plan(self, samples, nfft, hop):
+        # type: (int, int, int) -> Tuple[int, int]
+        """Frames per computation block and the number of adjacent frames to
+        average together in the output.
+
+        Half of the budget goes to the working blocks and half to the output
+        so the blocks are always a multiple of the averaging factor.  Blocks
+        are never more than `_STFT_BLOCK_BYTES` unless averaging needs them.
+        """
+        frames = max(1, (samples - nfft) // hop + 1)
+        block_bytes = _STFT_BLOCK_BYTES
+        if self.limit is not None:
+            block_bytes = min(block_bytes, self.limit // 2)
+        block_frames = max(1, block_bytes // (nfft * _STFT_BYTES_PER_BIN))
+        if self.limit is None:
+            return min(frames, block_frames), 1
+        # The output image is float32 plus the uint8 image that is drawn
+        average = self.reduction(2 * frames * nfft * 5)
+        # The last output row may average fewer frames
+        while (average < frames and
+               2 * -(-frames // average) * nfft * 5 > self.limit):
+            average += 1
+        block_frames = max(average, block_frames // average * average)
+        return block_frames, average
+
+
+Persistence = namedtuple('Persistence', ['counts', 'max_hold', 'min_hold',
+                                         'db_range'])
+
+
+class STFTEngine(object):
+    """Single precision short time Fourier transform.
+
+    Frames are taken as strided views of the data with `sliding_window_view`
+    and transformed `block_frames` at a time through buffers that are reused
+    between blocks and calls, so the only full size allocation is the output
+    image.  With `detrend` each frame has its mean removed before windowing
+    to match the scipy 'constant' detrend.
+    """
+    def __init__(self,
+                 window,  # type: numpy.ndarray
+                 nfft=None,  # type: Optional[int]
+                 hop=None,  # type: Optional[int]
+                 block_frames=256,  # type: int
+                 detrend=True,  # type: bool
+                 ):
+        # type: (...) -> None
+        self.detrend = detrend
+        self.window = numpy.asarray(window, dtype=numpy.float32)
+        self.nperseg = len(self.window)
+        self.nfft = nfft or self.nperseg
+        self.hop = hop or self.nperseg
+        self.block_frames = block_frames
+        self._frames_buf = None  # type: Optional[numpy.ndarray]
+        self._power_buf = None  # type: Optional[numpy.ndarray]
+        self._out = None  # type: Optional[numpy.ndarray]
+
+    def num_frames(self, length):
+        # type: (int) -> int
+        if length < self.nperseg:
+            return 0
+        return (length - self.nperseg) // self.hop + 1
+
+    def spectrum_scale(self):
+        # type: () -> float
+        """Scale for power spectrum units, same as scipy 'spectrum'"""
+        return 1.0 / float(self.window.sum(dtype=numpy.float64)) ** 2
+
+    def density_scale(self, sample_rate):
+        # type: (float) -> float
+        """Scale for power spectral density units, same as scipy 'density'"""
+        win_power = float((self.window.astype(numpy.float64) ** 2).sum())
+        return 1.0 / (sample_rate * win_power)
+
+    def _iter_frames(self, data):
+        # type: (Any) -> Iterator[Tuple[int, numpy.ndarray]]
+        """Yield (first_frame, frames) of strided frame views for an array
+        or an iterable of chunks.  The samples after the last frame of a
+        chunk are carried over to the front of the next one, so frames span
+        chunk boundaries exactly as they would in one array."""
+        if isinstance(data, numpy.ndarray):
+            data = (data,)
+        first = 0
+        samples = 0
+        tail = None
+        for chunk in data:
+            samples += len(chunk)
+            if tail is not None and len(tail):
+                chunk = numpy.concatenate((tail, chunk))
+            count = self.num_frames(len(chunk))
+            if count:
+                yield first, sliding_window_view(
+                    chunk, self.nperseg
+                )[::self.hop][:count]
+                first += count
+            tail = chunk[count * self.hop:]
+        if first == 0:
+            raise ValueError(
+                'FFT size {0} is longer than the {1} samples in range'
+                .format(self.nperseg, samples)
+            )
+
+    def iter_power(self, data):
+        # type: (Any) -> Iterator[Tuple[int, numpy.ndarray]]
+        """Yield (first_frame, power) for blocks of frames.
+
+        `data` is an array or an iterable of chunks such as a
+        `SampleStream`, blocks are filled across chunks so they always
+        start on a multiple of `block_frames`.  `power` is |X|^2 in FFT
+        order with a row per frame.  It is a reused buffer so it is only
+        valid until the next block is requested.
+        """
+        if (self._frames_buf is None or
+                len(self._frames_buf) < self.block_frames or
+                self._frames_buf.shape[1] != self.nperseg or
+                self._power_buf.shape[1] != self.nfft):
+            self._frames_buf = numpy.empty(
+                (self.block_frames, self.nperseg), dtype=numpy.complex64
+            )
+            self._power_buf = numpy.empty(
+                (self.block_frames, self.nfft), dtype=numpy.float32
+            )
+
+        filled = 0
+        for first, frames in self._iter_frames(data):
+            idx = 0
+            while idx < len(frames):
+                count = min(self.block_frames - filled, len(frames) - idx)
+                self._frames_buf[filled:filled + count] = (
+                    frames[idx:idx + count]
+                )
+                filled += count
+                idx += count
+                if filled == self.block_frames:
+                    yield first + idx - filled, self._block_power(filled)
+                    filled = 0
+        if filled:
+            yield first + idx - filled, self._block_power(filled)
+
+    def _block_power(self, count):
+        # type: (int) -> numpy.ndarray
+        block = self._frames_buf[:count]
+        if self.detrend:
+            block -= block.mean(axis=1, keepdims=True)
+        block *= self.window
+        spectrum = sp_fft.fft(block, n=self.nfft, axis=1, overwrite_x=True)
+        power = self._power_buf[:count]
+        numpy.abs(spectrum, out=power)
+        numpy.square(power, out=power)
+        return power
+
+    def sample_power(self, data, count=64):
+        # type: (Any, int) -> numpy.ndarray
+        """|X|^2 of up to `count` frames spread evenly over the data, an
+        array or a sized iterable of chunks"""
+        step = max(1, -(-self.num_frames(len(data)) // count))
+        picked = [frames[-first % step::step].astype(numpy.complex64)
+                  for first, frames in self._iter_frames(data)]
+        block = numpy.concatenate(picked)
+        if self.detrend:
+            block -= block.mean(axis=1, keepdims=True)
+        block *= self.window
+        spectrum = sp_fft.fft(block, n=self.nfft, axis=1, overwrite_x=True)
+        power = numpy.abs(spectrum)
+        numpy.square(power, out=power)
+        return power
+
+    def mean_power(self, data):
+        # type: (Any) -> numpy.ndarray
+        """Unscaled and fftshifted mean |X|^2 of every frame, the Welch
+        average without the spectrogram"""
+        total = numpy.zeros(self.nfft, dtype=numpy.float64)
+        frames = 0
+        for first, power in self.iter_power(data):
+            total += power.sum(axis=0, dtype=numpy.float64)
+            frames = first + len(power)
+        total /= frames
+        return numpy.fft.fftshift(total)
+
+    def persistence(self,
+                    data,  # type: Any
+                    scale=1.0,  # type: float
+                    db_bins=256,  # type: int
+                    db_range=None,  # type: Optional[Tuple[float, float]]
+                    floor=1e-20,  # type: float
+                    ):
+        # type: (...) -> Persistence
+        """Histogram of frame power over (frequency, dB) in one pass.
+
+        Every frame is binned into a fixed `nfft` x `db_bins` accumulator as
+        the blocks stream past, along with the max and min hold of each
+        bin, so memory does not grow with the number of frames.  If no dB
+        range is given it is estimated from a sample of frames, which takes
+        a second pass over streamed data.  Results are fftshifted.
+        """
+        if db_range is None:
+            sample = self.sample_power(data)
+            sample *= scale
+            numpy.maximum(sample, floor, out=sample)
+            sample_db = 10.0 * numpy.log10(sample)
+            db_range = (float(numpy.percentile(sample_db, 0.1)) - 10.0,
+                        float(sample_db.max()) + 10.0)
+        db_low, db_high = db_range
+        db_scale = db_bins / (db_high - db_low)
+
+        counts = numpy.zeros(self.nfft * db_bins, dtype=numpy.int64)
+        max_hold = numpy.full(self.nfft, -numpy.inf, dtype=numpy.float32)
+        min_hold = numpy.full(self.nfft, numpy.inf, dtype=numpy.float32)
+        # Bin offsets of each column, exact in float32 for any nfft in use
+        column = numpy.arange(self.nfft, dtype=numpy.float32) * db_bins
+        # Blocks are bounded whatever block size the engine was given
+        block_frames = self.block_frames
+        self.block_frames = min(block_frames, max(
+            1, _STFT_BLOCK_BYTES // (self.nfft * _STFT_BYTES_PER_BIN)
+        ))
+        bins_buf = numpy.empty((self.block_frames, self.nfft), numpy.intp)
+        try:
+            for _, power in self.iter_power(data):
+                # Convert the reused power block to dB and then to bin
+                # indices in place
+                power *= scale
+                numpy.maximum(power, floor, out=power)
+                numpy.log10(power, out=power)
+                power *= 10.0
+                numpy.maximum(max_hold, power.max(axis=0), out=max_hold)
+                numpy.minimum(min_hold, power.min(axis=0), out=min_hold)
+
+                power -= db_low
+                power *= db_scale
+                numpy.floor(power, out=power)
+                numpy.clip(power, 0, db_bins - 1, out=power)
+                power += column
+                bins = bins_buf[:len(power)]
+                numpy.copyto(bins, power, casting='unsafe')
+                counts += numpy.bincount(bins.ravel(), minlength=len(counts))
+        finally:
+            self.block_frames = block_frames
+
+        counts = numpy.fft.fftshift(counts.reshape(self.nfft, db_bins), axes=0)
+        return Persistence(counts, numpy.fft.fftshift(max_hold),
+                           numpy.fft.fftshift(min_hold), (db_low, db_high))
+
+    def spectrogram(self, data, scale=1.0, average=1, floor=1e-20):
+        # type: (Any, float, int, float) -> numpy.ndarray
+        """Power in dB with a row per frame and fftshifted columns.
+
+        Groups of `average` adjacent frames are averaged into one row, the
+        block size is rounded to keep groups within a block.  Power is
+        clamped to `floor` before the log so silence never divides by zero.
+        The returned array is reused by the next call with the same shape.
+        """
+        return self.analyze(data, scale, average, floor)[0]
+
+    def analyze(self,
+                data,  # type: Any
+                scale=1.0,  # type: float
+                average=1,  # type: int
+                floor=1e-20,  # type: float
+                ):
+        # type: (...) -> Tuple[numpy.ndarray, numpy.ndarray]
+        """The `spectrogram` along with the mean |X|^2 of every frame.
+
+        The mean is unscaled, fftshifted and accumulated in float64 from the
+        same blocks as the spectrogram, it is the Welch average once scaled
+        by `density_scale`.
+        """
+        average = max(1, average)
+        self.block_frames = max(average,
+                                self.block_frames // average * average)
+        rows = -(-self.num_frames(len(data)) // average)
+        if self._out is None or self._out.shape != (rows, self.nfft):
+            self._out = numpy.empty((rows, self.nfft), dtype=numpy.float32)
+        out = self._out
+
+        # fftshift is applied while copying each block into the output
+        split = self.nfft - self.nfft // 2
+        total = numpy.zeros(self.nfft, dtype=numpy.float64)
+        frames = 0
+        for first, power in self.iter_power(data):
+            total += power.sum(axis=0, dtype=numpy.float64)
+            frames = first + len(power)
+            row = first // average
+            if average > 1:
+                starts = numpy.arange(0, len(power), average)
+                counts = numpy.diff(numpy.append(starts, len(power)))
+                power = numpy.add.reduceat(power, starts, axis=0)
+                power /= counts[:, numpy.newaxis]
+            out[row:row + len(power), :self.nfft - split] = power[:, split:]
+            out[row:row + len(power), self.nfft - split:] = power[:, :split]
+
+        if -(-frames // average) < rows:
+            # A stream ends early if its file is truncated under it
+            out = out[:-(-frames // average)]
+        out *= scale
+        numpy.maximum(out, floor, out=out)
+        numpy.log10(out, out=out)
+        out *= 10.0
+        total /= frames
+        return out, numpy.fft.fftshift(total)
+
+
+def zoom_psd(data,  # type: Any
+             sample_rate,  # type: float
+             band,  # type: Tuple[float, float]
+             window,  # type: numpy.ndarray
+             chunk_size=1 << 20,  # type: int
+             ):
+    # type: (...) -> Tuple[numpy.ndarray, numpy.ndarray]
+    """High resolution Welch PSD of only `band` (Hz, baseband).
+
+    The band is mixed down to DC and decimated with a `ChannelFilter`
+    before the Welch average, so the FFT size buys a resolution of
+    `sample_rate / decimation / nfft` and the FFT work is proportional to
+    the zoomed band.  `data` is an array or a `SampleStream` and the
+    decimated band is consumed as it is produced.  The decimation is
+    limited so at least one frame fits in the data.  Returns the
+    frequencies and density inside the band.
+    """
+    nfft = len(window)
+    low, high = min(band), max(band)
+    span = max(high - low, sample_rate / len(data))
+    # Keep a 25% guard band for the decimation filter roll off
+    down = max(1, int(sample_rate / (span * 1.25)))
+    down = max(1, min(down, len(data) // nfft))
+
+    channel = ChannelFilter(sample_rate, (low + high) / 2.0, 1, down)
+    chunks = data
+    if isinstance(data, numpy.ndarray):
+        chunks = (data[idx:idx + chunk_size]
+                  for idx in range(0, len(data), chunk_size))
+    narrow = (channel.process(chunk) for chunk in chunks)
+
+    # The band center is at DC after mixing, detrending would remove it
+    engine = STFTEngine(window, hop=nfft - nfft // 4, detrend=False)
+    mean_power = engine.mean_power(narrow)
+    psd = mean_power * engine.density_scale(channel.output_rate)
+    freqs = numpy.fft.fftshift(
+        numpy.fft.fftfreq(nfft, 1.0 / channel.output_rate)
+    ) + (low + high) / 2.0
+    in_band = (freqs >= low) & (freqs <= high)
+    return freqs[in_band], psd[in_band]
+
+
+# `image` is `spec` quantized to uint8 at the dB `levels`, made on first draw
+STFTProduct = namedtuple('STFTProduct', [
+    'data', 'key', 'mean_power', 'spec', 'average', 'image', 'levels',
+])
+
+
+class LRUCache(OrderedDict):
+    """Small least recently used cache for derived data.
+
+    Entries can be given a size in bytes, when `max_bytes` is set the
+    oldest entries are dropped until the total fits.
+    """
+    def __init__(self, max_size=4, max_bytes=None):
+        # type: (int, Optional[int]) -> None
+        OrderedDict.__init__(self)
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._sizes = {}  # type: Dict[Any, int]
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def put(self, key, value, nbytes=0):
+        # type: (Any, Any, int) -> None
+        self.nbytes += nbytes - self._sizes.get(key, 0)
+        self._sizes[key] = nbytes
+        self[key] = value
+        self.move_to_end(key)
+        self.trim()
+
+    def trim(self):
+        # type: () -> None
+        """Drop the oldest entries until the cache is within its limits"""
+        while len(self) > self.max_size or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes):
+            key, _ = self.popitem(last=False)
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    def clear(self):
+        OrderedDict.clear(self)
+        self._sizes.clear()
+        self.nbytes = 0
+
+
+class ChannelFilter(object):
+    """Streaming frequency shift and polyphase rational resampler.
+
+    Chunks are shifted by -`shift` Hz, upsampled by `up`, low pass filtered
+    and downsampled by `down`.  The mixer phase and the filter history are
+    carried across calls to `process` so feeding a signal in chunks gives
+    the same output as processing it in one go.  The default filter matches
+    the one used by `scipy.signal.resample_poly`.
+    """
+    def __init__(self, sample_rate, shift=0.0, up=1, down=1, taps=None):
+        # type: (float, float, int, int, Optional[numpy.ndarray]) -> None
+        divisor = math.gcd(up, down)
+        self.sample_rate = sample_rate
+        self.shift = shift
+        self.up = up // divisor
+        self.down = down // divisor
+        if taps is None and (self.up, self.down) != (1, 1):
+            max_rate = max(self.up, self.down)
+            half_len = 10 * max_rate
+            taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate,
+                                 window=('kaiser', 5.0)) * self.up
+        self.taps = taps
+        self.reset()
+
+    def reset(self):
+        # type: () -> None
+        self._n_in = 0  # Input samples consumed
+        self._n_out = 0  # Output samples produced
+        self._base = 0  # Input index of the first history sample
+        self._history = numpy.zeros(0, dtype=numpy.complex64)
+
+    @property
+    def output_rate(self):
+        # type: () -> float
+        return self.sample_rate * self.up / self.down
+
+    @property
+    def delay(self):
+        # type: () -> float
+        """Group delay of the resampling filter in seconds"""
+        if self.taps is None:
+            return 0.0
+        return (len(self.taps) - 1) / 2.0 / (self.sample_rate * self.up)
+
+    def output_length(self, input_length):
+        # type: (int) -> int
+        return -(-input_length * self.up // self.down)
+
+    def process(self, chunk):
+        # type: (numpy.ndarray) -> numpy.ndarray
+        if self.shift:
+            phase = numpy.arange(self._n_in, self._n_in + len(chunk),
+                                 dtype=numpy.float64)
+            phase *= -2.0 * numpy.pi * self.shift / self.sample_rate
+            chunk = chunk * numpy.exp(1j * phase).astype(numpy.complex64)
+        if self.taps is None:
+            self._n_in += len(chunk)
+            return chunk
+
+        up, down = self.up, self.down
+        buf = numpy.concatenate((self._history, chunk))
+        n_in = self._n_in + len(chunk)
+        # The history always starts on a multiple of `down` so output j of
+        # upfirdn lines up with output `base_out + j` of the whole signal
+        base_out = self._base * up // down
+        n_out = self.output_length(n_in)
+        out = signal.upfirdn(self.taps, buf, up, down)
+        out = out[self._n_out - base_out:n_out - base_out]
+
+        # Keep enough history for the filter taps of the next output
+        base = (n_out * down - (len(self.taps) - 1)) // up // down * down
+        base = max(base, 0)
+        self._history = buf[base - self._base:]
+        self._base = base
+        self._n_in = n_in
+        self._n_out = n_out
+        return out.astype(numpy.complex64, copy=False)
+
+
+class PlotData(namedtuple('PlotData', ['data', 'sample_rate', 'center',
+                                       'start_time'])):
+    """Samples handed to the plots along with the rate and center frequency
+    they represent"""
+    def time_range(self):
+        t_range = numpy.arange(len(self.data), dtype=numpy.float64)
+        t_range /= self.sample_rate
+        t_range += self.start_time
+        return t_range
+
+
+class Cancelled(Exception):
+    """Raised out of a `SampleStream` that was cancelled while being read"""
+
+
+class SampleStream(object):
+    """The range of a data source after a `ChannelFilter`, produced a
+    chunk at a time each time it is iterated so the range is never held.
+
+    Samples come from the in-memory `data` of the source when it has some,
+    which may be the prefix of a load in progress, otherwise they are read
+    from the capture.  Streams over the same samples and settings share a
+    `key`.  A `watched` copy can be cancelled and reports its progress, so
+    it can be consumed on a worker thread.
+    """
+    def __init__(self,
+                 source,  # type: DataSource
+                 sample_rate,  # type: float
+                 shift=0.0,  # type: float
+                 up=1,  # type: int
+                 down=1,  # type: int
+                 chunk_size=1 << 20,  # type: int
+                 ):
+        # type: (...) -> None
+        self._data = source.data
+        self._capture = source.capture
+        self._data_type = numpy.dtype(source.data_type)
+        self.start = source.start
+        self.end = source.end
+        if source.data is not None:
+            self.end = source.start + len(source.data)
+        self.chunk_size = chunk_size
+        self._channel = (sample_rate, shift, up, down)
+        channel = ChannelFilter(sample_rate, shift, up, down)
+        self.sample_rate = channel.output_rate
+        self.center = shift
+        self.start_time = self.start / sample_rate - channel.delay
+        self._length = channel.output_length(self.end - self.start)
+        self.key = (self._capture.path, self._capture.stat_key,
+                    self._data_type.name, self.start, self.end) + self._channel
+        self._cancelled = None  # type: Optional[Callable[[], bool]]
+        self._progress = None  # type: Optional[Callable[[int, int], None]]
+
+    def watched(self,
+                cancelled,  # type: Callable[[], bool]
+                progress,  # type: Callable[[int, int], None]
+                ):
+        # type: (...) -> SampleStream
+        """Copy of the stream that raises `Cancelled` once `cancelled()` is
+        true and calls `progress(done, total)` with the input samples read
+        after every chunk"""
+        stream = copy.copy(self)
+        stream._cancelled = cancelled
+        stream._progress = progress
+        return stream
+
+    def __len__(self):
+        # type: () -> int
+        return self._length
+
+    def _iter_input(self):
+        # type: () -> Iterator[numpy.ndarray]
+        if self._data is not None:
+            for idx in range(0, len(self._data), self.chunk_size):
+                yield self._data[idx:idx + self.chunk_size]
+            return
+        data_size = self._data_type.itemsize
+        for block in self._capture.iter_read(
+                self.start * data_size, (self.end - self.start) * data_size,
+                self.chunk_size * data_size):
+            yield numpy.frombuffer(block, self._data_type,
+                                   len(block) // data_size)
+
+    def __iter__(self):
+        # type: () -> Iterator[numpy.ndarray]
+        channel = ChannelFilter(*self._channel)
+        total = self.end - self.start
+        done = 0
+        for chunk in self._iter_input():
+            if self._cancelled is not None and self._cancelled():
+                raise Cancelled()
+            done += len(chunk)
+            chunk = channel.process(chunk)
+            if len(chunk):
+                yield chunk
+            if self._progress is not None:
+                self._progress(done, total)
+
+    def read(self):
+        # type: () -> numpy.ndarray
+        """All of the samples in one complex64 array"""
+        out = numpy.empty(len(self), dtype=numpy.complex64)
+        filled = 0
+        for chunk in self:
+            out[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        return out[:filled]
+
+
+def _same_samples(first, second):
+    # type: (Any, Any) -> bool
+    """If two plot inputs hold the same samples, streams are compared by
+    what they read as a new stream is made for every refresh"""
+    if isinstance(first, SampleStream) and isinstance(second, SampleStream):
+        return first.key == second.key
+    return first is second
+
+
+_PREPROCESS_CACHE = LRUCache()
+
+
+def _preprocessed(stream, cache_bytes=None):
+    # type: (SampleStream, Optional[int]) -> Optional[PlotData]
+    """Cached samples of a stream, `cache_bytes` bounds the cache"""
+    cached = _PREPROCESS_CACHE.get(stream.key)
+    _PREPROCESS_CACHE.max_bytes = cache_bytes
+    _PREPROCESS_CACHE.trim()
+    return cached
+
+
+def _cache_preprocessed(stream, samples):
+    # type: (SampleStream, numpy.ndarray) -> PlotData
+    result = PlotData(
+        data=samples,
+        sample_rate=stream.sample_rate,
+        center=stream.center,
+        start_time=stream.start_time,
+    )
+    _PREPROCESS_CACHE.put(stream.key, result, samples.nbytes)
+    return result
+
+
+def preprocess(source,  # type: DataSource
+               sample_rate,  # type: float
+               shift=0.0,  # type: float
+               up=1,  # type: int
+               down=1,  # type: int
+               chunk_size=1 << 20,  # type: int
+               cache_bytes=None,  # type: Optional[int]
+               ):
+    # type: (...) -> PlotData
+    """Run the range of a source through a `ChannelFilter`.
+
+    The range is streamed in chunks through a `SampleStream` so the raw
+    samples of a range that is not in memory are never held.  Results are
+    cached on the samples and the processing settings, `cache_bytes`
+    bounds the cached results including this one.
+    """
+    stream = SampleStream(source, sample_rate, shift, up, down, chunk_size)
+    cached = _preprocessed(stream, cache_bytes)
+    if cached is not None:
+        return cached
+    return _cache_preprocessed(stream, stream.read())
+
+
 class FileSettingsWidget(QGroupBox):
     """Widget that holds information and settings for a data source"""
     def __init__(self, title, change_cb, sample_rate=8000,
@@ -84,7 +871,8 @@ class FileSettingsWidget(QGroupBox):
 
         self._sample_rate_w = QDoubleSpinBox()
         self._sample_rate_w.setMinimum(0.0)
-        self._sample_rate_w.setMaximum(1000000)  # Can there be no max?
+        # Header rates of wideband captures are well above audio rates
+        self._sample_rate_w.setMaximum(1e12)
         self._sample_rate_w.setValue(sample_rate)
         self._sample_rate_w.valueChanged.connect(self._sample_rate_change)
 
@@ -124,6 +912,13 @@ class FileSettingsWidget(QGroupBox):
     def data_type(self):
         return self._data_type_w.currentText()
 
+    @data_type.setter
+    def data_type(self, type_str):
+        # Reflects the type of the source, which does not need a reload
+        self._data_type_w.blockSignals(True)
+        self._data_type_w.setCurrentText(type_str)
+        self._data_type_w.blockSignals(False)
+
     @property
     def sample_rate(self):
         return float(self._sample_rate_w.value())
@@ -163,11 +958,18 @@ class FFTSettingsWidget(QGroupBox):
         self._window_w.addItems(_WINDOW_FUNCTIONS)
         self._window_w.setCurrentIndex(_WINDOW_FUNCTIONS.index('blackman'))
         self._window_w.currentIndexChanged.connect(change_cb)
+        self._zoom_w = QCheckBox()
+        self._zoom_w.setToolTip(
+            'Drag the region on the PSD to compute a high resolution PSD '
+            'of just that band'
+        )
+        self._zoom_w.stateChanged.connect(change_cb)
 
         fft_layout = QFormLayout()
         fft_layout.addRow(self._warning_w, None)
         fft_layout.addRow(QLabel('Window Function'), self._window_w)
         fft_layout.addRow(QLabel('Size'), self._size_w)
+        fft_layout.addRow(QLabel('Zoom PSD'), self._zoom_w)
         self.setLayout(fft_layout)
 
     @property
@@ -178,6 +980,10 @@ class FFTSettingsWidget(QGroupBox):
     def fft_window(self):
         return self._window_w.currentText()
 
+    @property
+    def zoom(self):
+        return self._zoom_w.isChecked()
+
     def show_warning(self, state, err=''):
         if state:
             self.setToolTip(err)
@@ -186,6 +992,190 @@ class FFTSettingsWidget(QGroupBox):
             self._warning_w.hide()
 
 
+class ChannelSettingsWidget(QGroupBox):
+    """Frequency shift and resampling applied before plotting"""
+    def __init__(self, title, change_cb):
+        QGroupBox.__init__(self, title)
+        self._change_cb = change_cb
+
+        self._shift_w = QDoubleSpinBox()
+        self._shift_w.setRange(-1e10, 1e10)
+        self._shift_w.setSuffix(' Hz')
+        self._shift_w.valueChanged.connect(self._change)
+
+        self._down_w = QSpinBox()
+        self._down_w.setRange(1, 4096)
+        self._down_w.valueChanged.connect(self._change)
+
+        self._up_w = QSpinBox()
+        self._up_w.setRange(1, 256)
+        self._up_w.valueChanged.connect(self._change)
+
+        layout = QFormLayout()
+        layout.addRow(QLabel('Center Frequency'), self._shift_w)
+        layout.addRow(QLabel('Decimation'), self._down_w)
+        layout.addRow(QLabel('Interpolation'), self._up_w)
+        self.setLayout(layout)
+
+    def _change(self):
+        self._change_cb(self.shift, self.up, self.down)
+
+    @property
+    def shift(self):
+        return float(self._shift_w.value())
+
+    @property
+    def up(self):
+        return int(self._up_w.value())
+
+    @property
+    def down(self):
+        return int(self._down_w.value())
+
+
+class MemorySettingsWidget(QGroupBox):
+    """Memory budget used to pick the plotting resolution"""
+    def __init__(self, title, change_cb, budget_mb=None):
+        QGroupBox.__init__(self, title)
+        self._change_cb = change_cb
+
+        self._budget_w = QSpinBox()
+        # Zero is shown as unlimited
+        self._budget_w.setRange(0, 1 << 20)
+        self._budget_w.setSpecialValueText('Unlimited')
+        self._budget_w.setSuffix(' MB')
+        self._budget_w.setValue(budget_mb or 0)
+        self._budget_w.valueChanged.connect(self._change)
+
+        layout = QFormLayout()
+        layout.addRow(QLabel('Budget'), self._budget_w)
+        self.setLayout(layout)
+
+    def _change(self):
+        self._change_cb(self.budget)
+
+    @property
+    def budget(self):
+        # type: () -> Optional[int]
+        """Budget in bytes"""
+        value = int(self._budget_w.value())
+        if value == 0:
+            return None
+        return value << 20
+
+
+class SegmentSettingsWidget(QGroupBox):
+    """Time and segment seek for captures with a metadata header"""
+    def __init__(self, title, seek_cb):
+        QGroupBox.__init__(self, title)
+        self._seek_cb = seek_cb
+
+        self._segments_w = QLabel('0')
+        self._start_w = QLabel('Unknown')
+
+        self._time_w = QDoubleSpinBox()
+        self._time_w.setDecimals(6)
+        self._time_w.setSuffix(' s')
+        time_go_w = QPushButton('Seek')
+        time_go_w.clicked.connect(self._time_seek)
+
+        self._segment_w = QSpinBox()
+        segment_go_w = QPushButton('Seek')
+        segment_go_w.clicked.connect(self._segment_seek)
+
+        layout = QGridLayout()
+        layout.addWidget(QLabel('Segments'), 0, 0)
+        layout.addWidget(self._segments_w, 0, 1)
+        layout.addWidget(QLabel('Start Time'), 1, 0)
+        layout.addWidget(self._start_w, 1, 1)
+        layout.addWidget(QLabel('Time Offset'), 2, 0)
+        layout.addWidget(self._time_w, 2, 1)
+        layout.addWidget(time_go_w, 2, 2)
+        layout.addWidget(QLabel('Segment'), 3, 0)
+        layout.addWidget(self._segment_w, 3, 1)
+        layout.addWidget(segment_go_w, 3, 2)
+        self.setLayout(layout)
+        self.hide()
+
+    def _time_seek(self):
+        self._seek_cb(time=float(self._time_w.value()))
+
+    def _segment_seek(self):
+        self._seek_cb(segment=int(self._segment_w.value()))
+
+    def set_metadata(self, metadata):
+        # type: (Optional[CaptureMetadata]) -> None
+        if metadata is None:
+            self.hide()
+            return
+        segments = metadata.segments
+        last = segments[-1]
+        self._segments_w.setText(str(len(segments)))
+        self._start_w.setText('{0:.6f}'.format(metadata.start_time))
+        self._time_w.setMaximum(
+            last.rx_time + last.samples / last.sample_rate -
+            metadata.start_time
+        )
+        self._segment_w.setMaximum(len(segments) - 1)
+        self.show()
+
+
+class BurstSettingsWidget(QGroupBox):
+    """Burst detection and navigation between the bursts found"""
+    def __init__(self, title, detect_cb, step_cb):
+        QGroupBox.__init__(self, title)
+
+        self._threshold_w = QDoubleSpinBox()
+        self._threshold_w.setRange(0.0, 100.0)
+        self._threshold_w.setValue(10.0)
+        self._threshold_w.setSuffix(' dB')
+        self._band_w = QCheckBox('Zoom Band Only')
+
+        self._detect_w = QPushButton('Detect')
+        self._detect_w.clicked.connect(detect_cb)
+        self._position_w = QLabel('Not Detected')
+        prev_w = QPushButton('Prev')
+        prev_w.clicked.connect(lambda: step_cb(-1))
+        next_w = QPushButton('Next')
+        next_w.clicked.connect(lambda: step_cb(1))
+
+        layout = QGridLayout()
+        layout.addWidget(QLabel('Threshold'), 0, 0)
+        layout.addWidget(self._threshold_w, 0, 1, 1, 2)
+        layout.addWidget(self._band_w, 1, 0, 1, 2)
+        layout.addWidget(self._detect_w, 1, 2)
+        layout.addWidget(prev_w, 2, 0)
+        layout.addWidget(self._position_w, 2, 1)
+        layout.addWidget(next_w, 2, 2)
+        self.setLayout(layout)
+
+    @property
+    def threshold(self):
+        # type: () -> float
+        return float(self._threshold_w.value())
+
+    @property
+    def band_only(self):
+        # type: () -> bool
+        return self._band_w.isChecked()
+
+    def set_detecting(self, detecting):
+        # type: (bool) -> None
+        self._detect_w.setEnabled(not detecting)
+        if detecting:
+            self._position_w.setText('Detecting')
+
+    def set_position(self, index, count):
+        # type: (int, Optional[int]) -> None
+        if count is None:
+            text = 'Not Detected'
+        elif index < 0:
+            text = '{0} found'.format(count)
+        else:
+            text = '{0} of {1}'.format(index + 1, count)
+        self._position_w.setText(text)
+
+
 class ColorWellWidget(QPushButton):
     def __init__(self, size=QSize(50, 40), color=QColor(0, 0, 0)):
         QPushButton.__init__(self)
@@ -281,7 +1271,8 @@ class SpectrogramStyleWidget(QGroupBox):
     def _gradient_update(self):
         gradient = self._gradient_map[self._gradient.currentText()]
         color_map = pg.ColorMap(*zip(*gradient['ticks']))
-        self._plot.setLookupTable(color_map.getLookupTable())
+        # One entry per level of a quantized uint8 image
+        self._plot.setLookupTable(color_map.getLookupTable(nPts=256))
 
 
 class PlotStyleSettingsWidget(QGroupBox):
@@ -315,7 +1306,7 @@ class PlotStyleSettingsWidget(QGroupBox):
 
 
 class PlotSettingsWidget(QWidget):
-    def __init__(self, plot_widget):
+    def __init__(self, plot_widget, memory_budget=None):
         QWidget.__init__(self)
 
         self._plot_widget = plot_widget
@@ -328,6 +1319,28 @@ class PlotSettingsWidget(QWidget):
         # Construct the fft settings
         self._fft_settings = FFTSettingsWidget('FFT:', self._fft_change)
 
+        self._channel_settings = ChannelSettingsWidget(
+            'Channel:', self._channel_change
+        )
+
+        self._memory_settings = MemorySettingsWidget(
+            'Memory:', self._memory_change, memory_budget
+        )
+
+        self._segment_settings = SegmentSettingsWidget(
+            'Segments:', self._seek_change
+        )
+
+        self._burst_settings = BurstSettingsWidget(
+            'Bursts:', self._detect_bursts, self._burst_step
+        )
+        self._bursts = numpy.empty((0, 2), numpy.int64)
+        # Burst in view, jumps step from here so each is a lookup
+        self._burst_idx = -1
+        self._burst_thread = None  # type: Optional[BurstDetectThread]
+        # Header values are only applied when a new file is opened
+        self._source_path = None  # type: Optional[str]
+
         # Maybe create a few of these for each of the plots and then turn
         # them on and off
         self._plot_style_settings = PlotStyleSettingsWidget('Plot Style:')
@@ -348,10 +1361,11 @@ class PlotSettingsWidget(QWidget):
             )
         plot_container = self._plot_widget.get_plot('psd')
         self._fft_tabs.add(plot_container.tab_idx)
-        self._plot_style_settings.add_plot(
-            plot_container.plot.plotItem.dataItems[0],
-            plot_container.tab_idx
-        )
+        for data_item in plot_container.plot.plotItem.dataItems:
+            self._plot_style_settings.add_plot(
+                data_item,
+                plot_container.tab_idx
+            )
 
         plot_container = self._plot_widget.get_plot('spec')
         self._fft_tabs.add(plot_container.tab_idx)
@@ -364,15 +1378,46 @@ class PlotSettingsWidget(QWidget):
             'Spectrogram'
         )
 
+        plot_container = self._plot_widget.get_plot('persist')
+        self._fft_tabs.add(plot_container.tab_idx)
+        persist_plot = plot_container.plot.plotItem
+        persist_image = next(plot_item for plot_item in persist_plot.items if
+                             isinstance(plot_item, pg.ImageItem))
+        self._plot_style_settings.add_spectrogram(
+            persist_image,
+            plot_container.tab_idx,
+            'Persistence'
+        )
+        for data_item in persist_plot.dataItems:
+            self._plot_style_settings.add_plot(
+                data_item,
+                plot_container.tab_idx
+            )
+
+        plot_container = self._plot_widget.get_plot('const')
+        const_plot = plot_container.plot.plotItem
+        const_image = next(plot_item for plot_item in const_plot.items if
+                           isinstance(plot_item, pg.ImageItem))
+        self._plot_style_settings.add_spectrogram(
+            const_image,
+            plot_container.tab_idx,
+            'Constellation'
+        )
+
         # Add setting groups to settings box
         settings_layout = QVBoxLayout()
         settings_layout.addWidget(self._file_info)
+        settings_layout.addWidget(self._segment_settings)
+        settings_layout.addWidget(self._burst_settings)
         settings_layout.addWidget(self._fft_settings)
+        settings_layout.addWidget(self._channel_settings)
+        settings_layout.addWidget(self._memory_settings)
         settings_layout.addWidget(self._plot_style_settings)
         settings_layout.addStretch()
         self.setLayout(settings_layout)
 
         # Reflect the settings down
+        self._plot_widget.memory_budget.limit = self._memory_settings.budget
         self._file_change()
         self._fft_change()
         self.source_update()
@@ -407,19 +1452,146 @@ class PlotSettingsWidget(QWidget):
             self._plot_widget.set_fft(
                 self._fft_settings.fft_size, self._fft_settings.fft_window
             )
+            self._plot_widget.set_zoom(self._fft_settings.zoom)
             self._fft_settings.show_warning(False)
         except ValueError as err:
             self._fft_settings.show_warning(True, str(err))
             logger.warning('Failed to apply FFT settings "%s"', str(err))
 
+    def _channel_change(self, shift, up, down):
+        logger.debug(
+            "Channel Settings updated:\n\tShift: %f\n\tUp: %d\n\tDown %d",
+            shift, up, down,
+        )
+        try:
+            self._plot_widget.set_channel(shift, up, down)
+        except Exception as err:  # pylint: disable=W0703
+            logger.warning('Failed to apply channel settings "%s"', str(err))
+
+    def _memory_change(self, budget):
+        logger.debug('Memory budget updated: %s', budget)
+        try:
+            self._plot_widget.set_memory_budget(budget)
+        except Exception as err:  # pylint: disable=W0703
+            logger.warning('Failed to apply memory budget "%s"', str(err))
+
+    def set_sample_rate(self, rate):
+        # type: (float) -> None
+        # Applied through the file settings so they stay in step
+        self._file_info.sample_rate = rate
+
+    def _seek_change(self, time=None, segment=None):
+        data_source = self._plot_widget.data_source
+        try:
+            if segment is not None:
+                data_source.seek_segment(segment)
+                logger.debug('Seeked to segment %d', segment)
+            else:
+                data_source.seek_time(data_source.metadata.start_time + time)
+                logger.debug('Seeked to %f s', time)
+            self._plot_widget.refresh_plot()
+            self.source_update()
+        except Exception as err:  # pylint: disable=W0703
+            logger.warning('Failed to seek "%s"', str(err))
+
+    def _detect_bursts(self):
+        data_source = self._plot_widget.data_source
+        if data_source.source_path is None:
+            return
+        band = None
+        if self._burst_settings.band_only:
+            band = self._plot_widget.zoom_band
+        detector_args = {'threshold': self._burst_settings.threshold}
+        if band is not None:
+            detector_args['band'] = band
+        self.stop_threads()
+        self._burst_thread = BurstDetectThread(
+            data_source.source_path, numpy.dtype(data_source.data_type).name,
+            self._plot_widget.sample_rate, detector_args, self
+        )
+        self._burst_thread.found.connect(self._bursts_found)
+        self._burst_thread.failed.connect(self._bursts_failed)
+        self._burst_settings.set_detecting(True)
+        self._burst_thread.start()
+
+    def stop_threads(self):
+        # type: () -> None
+        """Cancel and wait for any burst detection still running"""
+        if self._burst_thread is not None:
+            self._burst_thread.cancel()
+            self._burst_thread.wait()
+
+    def _bursts_found(self, bursts):
+        if self.sender() is not self._burst_thread:
+            return
+        self._burst_settings.set_detecting(False)
+        self._set_bursts(bursts)
+        logger.debug('Found %d bursts', len(bursts))
+
+    def _bursts_failed(self, err):
+        if self.sender() is not self._burst_thread:
+            return
+        self._burst_settings.set_detecting(False)
+        self._burst_settings.set_position(-1, None)
+        logger.warning('Failed to detect bursts "%s"', err)
+
+    def _set_bursts(self, bursts):
+        # type: (numpy.ndarray) -> None
+        self._bursts = bursts
+        start = self._plot_widget.data_source.start
+        self._burst_idx = int(
+            numpy.searchsorted(bursts[:, 0], start, 'left')
+        ) - 1
+        self._burst_settings.set_position(-1, len(bursts))
+        self._plot_widget.set_bursts(bursts)
+
+    def _burst_step(self, step):
+        if not len(self._bursts):
+            return
+        self._burst_idx = min(max(self._burst_idx + step, 0),
+                              len(self._bursts) - 1)
+        data_source = self._plot_widget.data_source
+        try:
+            # Bursts shorter than an FFT are padded so every plot can
+            # refresh
+            start, end = burst_range(
+                int(self._bursts[self._burst_idx][0]),
+                int(self._bursts[self._burst_idx][1]),
+                self._plot_widget.fftsize,
+                data_source.capture.size //
+                numpy.dtype(data_source.data_type).itemsize
+            )
+            data_source.set_range(start, end)
+            self._plot_widget.refresh_plot()
+            self.source_update()
+        except Exception as err:  # pylint: disable=W0703
+            logger.warning('Failed to move to burst "%s"', str(err))
+        self._burst_settings.set_position(self._burst_idx, len(self._bursts))
+
     def source_update(self):
         # The source data has been updated, the settings widget needs
         # to be updated to reflect this change
         data_source = self._plot_widget.data_source
         if data_source is not None:
             self._file_info.file_name = data_source.source_path
-            if data_source.data is not None:
-                self._file_info.file_length = len(data_source.data)
+            if data_source.source_path is not None:
+                self._file_info.file_length = (
+                    data_source.end - data_source.start
+                )
+            if data_source.source_path != self._source_path:
+                self._source_path = data_source.source_path
+                self._file_info.data_type = numpy.dtype(
+                    data_source.data_type
+                ).name
+                if data_source.sample_rate is not None:
+                    self._file_info.sample_rate = data_source.sample_rate
+                self._segment_settings.set_metadata(data_source.metadata)
+                self.stop_threads()
+                self._burst_thread = None
+                self._burst_settings.set_detecting(False)
+                self._burst_settings.set_position(-1, None)
+                self._bursts = numpy.empty((0, 2), numpy.int64)
+                self._plot_widget.set_bursts(self._bursts)
 
     def context_update(self):
         # Something about the view has updated and the settings need to be
@@ -435,18 +1607,24 @@ class PlotSettingsWidget(QWidget):
         self._plot_style_settings.visible_group(tab_idx)
 
 
+class PlotPending(Exception):
+    """Raised by a plot refresh that waits on data being prepared"""
+
+
 class PlottingWidget(QWidget):
     """Container widget class that stores the different plots under
     a tab widget. This also contains the interfaces for controlling
     the data that is being shown"""
 
-    class PlotContainer(namedtuple('PlotContainer',
-                                   ['plot', 'name', 'tab_idx', 'redraw_f'])):
+    class PlotContainer(namedtuple('PlotContainer', ['plot', 'name', 'tab_idx',
+                                                     'redraw_f', 'data_f'])):
         def redraw(self, data):
             logger.debug('Redrawing plot: %s', self.name)
             if self.redraw_f is not None:
                 try:
                     self.redraw_f(self.plot, data)
+                except PlotPending:
+                    raise
                 except Exception:
                     logger.exception("A critical error prevented plot update"
                                      " check sample rate and data type.")
@@ -461,6 +1639,42 @@ class PlottingWidget(QWidget):
         self.fftsize = 256
         self.window = signal.windows.blackman(self.fftsize)
         self._sample_rate = 8000
+        # Resolution of the constellation density image, the render cost
+        # scales with this and not the number of samples
+        self.const_bins = 256
+        # Number of power bins in the persistence histogram
+        self.persist_bins = 256
+        # Channel selection applied before plotting (shift, up, down)
+        self._channel = (0.0, 1, 1)
+        self._stft_engine = None  # type: Optional[STFTEngine]
+        self._product = None  # type: Optional[STFTProduct]
+        self._zoom = False
+        # Last zoom PSD as (data, key, freqs, psd)
+        self._zoom_result = None  # type: Optional[Tuple]
+        # Last persistence histogram as (data, key, Persistence)
+        self._persist = None  # type: Optional[Tuple]
+        # Bursts as [start, end) samples, the ones in range are marked on the
+        # time and spectrogram plots up to `max_burst_marks`
+        self._bursts = numpy.empty((0, 2), numpy.int64)
+        self._burst_marks = defaultdict(list)  # type: Dict[Any, List]
+        self.max_burst_marks = 100
+        self.memory_budget = MemoryBudget()
+        if data_source is not None:
+            # Share the budget so the source knows when not to read a range
+            if data_source.memory_budget is not None:
+                self.memory_budget = data_source.memory_budget
+            data_source.memory_budget = self.memory_budget
+        # Called with a description of any fidelity reductions made to stay
+        # within the memory budget, empty when the view is full resolution
+        self.fidelity_cb = None
+        self._fidelity = []  # type: List[str]
+        # Streamed data is prepared on a worker, `prepare_cb` is called with
+        # the fraction read while it runs and None once it stops
+        self.prepare_cb = None
+        self.prepare_failed_cb = None
+        self._preparer = None  # type: Optional[PlotPrepareThread]
+        # Key and result of the last preparation to finish
+        self._prepared = None  # type: Optional[Tuple]
 
         layout = QVBoxLayout(self)
         # Initialize tab screen
@@ -477,7 +1691,8 @@ class PlottingWidget(QWidget):
             plot=pg.PlotWidget(),
             name='time',
             title='Time (IQ)',
-            redraw_f=self._refresh_time_plot
+            redraw_f=self._refresh_time_plot,
+            data_f=self.plot_data,
         )
         plot_time.plot.addLegend()
         plot_time.plot.plot(pen='b', name='I')
@@ -489,9 +1704,16 @@ class PlottingWidget(QWidget):
             plot=pg.PlotWidget(),
             name='psd',
             title='PSD',
-            redraw_f=self._refresh_psd_plot
+            redraw_f=self._refresh_psd_plot,
+            data_f=self.fft_data,
         )
         plot_psd.plot.plot(pen='b', name='PSD')
+        plot_psd.plot.plot(pen='y', name='Zoom')
+        self._zoom_region = pg.LinearRegionItem()
+        self._zoom_region.setZValue(-10)
+        self._zoom_region.hide()
+        self._zoom_region.sigRegionChangeFinished.connect(self.refresh_plot)
+        plot_psd.plot.addItem(self._zoom_region)
         plot_psd.plot.getAxis('bottom').setLabel('Frequency (Hz)')
         plot_psd.plot.getAxis('left').setLabel('Magnitude (dB)')
 
@@ -499,12 +1721,39 @@ class PlottingWidget(QWidget):
             plot=pg.PlotWidget(),
             name='spec',
             title='Spectrogram',
-            redraw_f=self._refresh_spec_plot
+            redraw_f=self._refresh_spec_plot,
+            data_f=self.fft_data,
         )
         plot_spec.plot.addItem(pg.ImageItem())
         plot_spec.plot.getAxis('bottom').setLabel('Frequency (Hz)')
         plot_spec.plot.getAxis('left').setLabel('Time (s)')
 
+        plot_persist = self._add_plot(
+            plot=pg.PlotWidget(),
+            name='persist',
+            title='Persistence',
+            redraw_f=self._refresh_persist_plot,
+            data_f=self.fft_data,
+        )
+        plot_persist.plot.addItem(pg.ImageItem())
+        plot_persist.plot.addLegend()
+        plot_persist.plot.plot(pen='r', name='Max Hold')
+        plot_persist.plot.plot(pen='c', name='Min Hold')
+        plot_persist.plot.getAxis('bottom').setLabel('Frequency (Hz)')
+        plot_persist.plot.getAxis('left').setLabel('Magnitude (dB)')
+
+        plot_const = self._add_plot(
+            plot=pg.PlotWidget(),
+            name='const',
+            title='Constellation',
+            redraw_f=self._refresh_const_plot,
+            data_f=self.plot_data,
+        )
+        plot_const.plot.addItem(pg.ImageItem())
+        plot_const.plot.setAspectLocked(True)
+        plot_const.plot.getAxis('bottom').setLabel('In-phase (V)')
+        plot_const.plot.getAxis('left').setLabel('Quadrature (V)')
+
         for container in self._plots:
             # Default to using the mouse for selecting region instead of pan
             # this can be change by the user by right clicking and selecting
@@ -525,7 +1774,7 @@ class PlottingWidget(QWidget):
                 break
         return (i_curve, q_curve)
 
-    def _add_plot(self, plot, name, title, redraw_f):
+    def _add_plot(self, plot, name, title, redraw_f, data_f):
         if name in self._plots:
             raise ValueError("Plot with name {} already exists".format(name))
 
@@ -533,7 +1782,8 @@ class PlottingWidget(QWidget):
             name=name,
             plot=plot,
             tab_idx=self.tabs.addTab(plot, title),
-            redraw_f=redraw_f
+            redraw_f=redraw_f,
+            data_f=data_f,
         )
         self._plots.append(plot_container)
         return plot_container
@@ -556,14 +1806,179 @@ class PlottingWidget(QWidget):
         # Need to look up the correct tab here for now just plot timeseries
 
         if self._data_source is not None:
-            if self._data_source.data is not None:
+            data = self._data_source.data
+            if (self._data_source.source_path is not None and
+                    (data is None or len(data) > 0)):
                 plot = self.get_active_plot()
                 if plot is not None:
-                    plot.redraw(self._data_source)
+                    self._fidelity = []
+                    try:
+                        plot.redraw(plot.data_f())
+                    except PlotPending:
+                        # Drawn again once the data is ready
+                        return
+                    # Anything still being prepared was for an older view
+                    self.cancel_prepare()
+                    self._prepared = None
+                    if self.fidelity_cb is not None:
+                        self.fidelity_cb(', '.join(self._fidelity))
+
+    @property
+    def preparing(self):
+        # type: () -> bool
+        return self._preparer is not None
+
+    def _prepare(self, key, compute_f, samples):
+        # type: (Tuple, Callable, Any) -> Any
+        """`compute_f(samples)` for a plot.
+
+        A `SampleStream` is read by a `PlotPrepareThread` so the GUI stays
+        responsive, `PlotPending` is raised until the result is ready and
+        the plot is refreshed to pick it up.  The result is only handed
+        out once, callers cache it.
+        """
+        if not isinstance(samples, SampleStream):
+            return compute_f(samples)
+        key += (samples.key,)
+        prepared = self._prepared
+        if prepared is not None and prepared[0] == key:
+            self._prepared = None
+            return prepared[1]
+        if self._preparer is not None and self._preparer.key == key:
+            raise PlotPending()
+
+        self.cancel_prepare()
+        self._prepared = None
+        preparer = PlotPrepareThread(key, compute_f, samples, self)
+        preparer.progress.connect(self._prepare_progress)
+        preparer.done.connect(self._prepare_done)
+        preparer.failed.connect(self._prepare_failed)
+        preparer.finished.connect(preparer.deleteLater)
+        self._preparer = preparer
+        preparer.start()
+        if self.prepare_cb is not None:
+            self.prepare_cb(0.0)
+        raise PlotPending()
+
+    def cancel_prepare(self):
+        # type: () -> None
+        """Abandon the data being prepared, the worker stops after its
+        current chunk"""
+        if self._preparer is None:
+            return
+        self._preparer.cancel()
+        self._preparer = None
+        if self.prepare_cb is not None:
+            self.prepare_cb(None)
+
+    def stop_threads(self):
+        # type: () -> None
+        """Cancel and wait for the workers still preparing data"""
+        self.cancel_prepare()
+        for preparer in self.findChildren(PlotPrepareThread):
+            preparer.cancel()
+            preparer.wait()
+
+    def _prepare_progress(self, permille):
+        if self.sender() is self._preparer and self.prepare_cb is not None:
+            self.prepare_cb(permille / 1000.0)
+
+    def _prepare_done(self, result):
+        if self.sender() is not self._preparer:
+            # Finished after being cancelled
+            return
+        self._prepared = (self._preparer.key, result)
+        self._preparer = None
+        if self.prepare_cb is not None:
+            self.prepare_cb(None)
+        self.refresh_plot()
+
+    def _prepare_failed(self, err):
+        if self.sender() is not self._preparer:
+            return
+        self._preparer = None
+        if self.prepare_cb is not None:
+            self.prepare_cb(None)
+        if self.prepare_failed_cb is not None:
+            self.prepare_failed_cb(err)
+
+    def _stream_chunk(self):
+        # type: () -> int
+        """Samples per chunk when a range is streamed"""
+        chunk_size = 1 << 20
+        if self.memory_budget.limit is not None:
+            # Chunks get half the budget like the STFT blocks
+            chunk_size = max(self.fftsize, min(chunk_size, (
+                self.memory_budget.limit // 2 // _STREAM_BYTES_PER_SAMPLE
+            )))
+        return chunk_size
+
+    def plot_data(self):
+        # type: () -> PlotData
+        """The data source after channel selection for the time and
+        constellation plots, decimated further if needed to stay within the
+        memory budget"""
+        source = self._data_source
+        shift, up, down = self._channel
+        length = source.end - source.start
+        if source.data is not None:
+            length = len(source.data)
+        samples = length * up // down
+        extra = self.memory_budget.reduction(
+            samples * (8 + _PLOT_BYTES_PER_SAMPLE)
+        )
+        if extra > 1:
+            down *= extra
+            self._fidelity.append('decimated x{0}'.format(extra))
+
+        if (shift, up, down) == (0.0, 1, 1) and source.data is not None:
+            return PlotData(
+                data=source.data,
+                sample_rate=self._sample_rate,
+                center=0.0,
+                start_time=source.start / self._sample_rate,
+            )
+        cache_bytes = None
+        if self.memory_budget.limit is not None:
+            # Cached results share the budget with the plot of this one
+            cache_bytes = max(0, self.memory_budget.limit - samples // extra *
+                              _PLOT_BYTES_PER_SAMPLE)
+        stream = SampleStream(source, self._sample_rate, shift, up, down,
+                              self._stream_chunk())
+        result = _preprocessed(stream, cache_bytes)
+        if result is None:
+            result = _cache_preprocessed(
+                stream, self._prepare(('read',), SampleStream.read, stream)
+            )
+        return result
+
+    def fft_data(self):
+        # type: () -> PlotData
+        """The data source after channel selection at full bandwidth for
+        the FFT plots.  Unless it is already in memory it is a
+        `SampleStream` so the FFTs read it a chunk at a time and are never
+        decimated to fit the memory budget."""
+        source = self._data_source
+        shift, up, down = self._channel
+        if (shift, up, down) == (0.0, 1, 1) and source.data is not None:
+            return PlotData(
+                data=source.data,
+                sample_rate=self._sample_rate,
+                center=0.0,
+                start_time=source.start / self._sample_rate,
+            )
+        stream = SampleStream(source, self._sample_rate, shift, up, down,
+                              self._stream_chunk())
+        return PlotData(
+            data=stream,
+            sample_rate=stream.sample_rate,
+            center=shift,
+            start_time=stream.start_time,
+        )
 
     def _refresh_time_plot(self, plot, data):
-        # type: (DataSource) -> None
-        time_range = data.time_range(self._sample_rate)
+        # type: (pg.PlotWidget, PlotData) -> None
+        time_range = data.time_range()
 
         # May want to subclass PlotItem to provide access to i and q
         i_curve, q_curve = self.get_iq(plot)
@@ -571,20 +1986,87 @@ class PlottingWidget(QWidget):
             i_curve.setData(time_range, data.data.real)
         if q_curve is not None:
             q_curve.setData(time_range, data.data.imag)
+        self._mark_bursts(plot, 'vertical')
+
+    def _mark_bursts(self, plot, orientation):
+        # type: (pg.PlotWidget, str) -> None
+        for mark in self._burst_marks.pop(plot, []):
+            plot.removeItem(mark)
+        source = self._data_source
+        bursts = self._bursts
+        first = numpy.searchsorted(bursts[:, 1], source.start, 'right')
+        last = numpy.searchsorted(bursts[:, 0], source.end, 'left')
+        last = min(last, first + self.max_burst_marks)
+        for start, end in bursts[first:last]:
+            mark = pg.LinearRegionItem(
+                (start / self._sample_rate, end / self._sample_rate),
+                orientation=orientation, movable=False,
+                brush=(255, 255, 0, 50),
+            )
+            mark.setZValue(10)
+            plot.addItem(mark)
+            self._burst_marks[plot].append(mark)
+
+    def _stft_plan(self, data):
+        # type: (PlotData) -> Tuple[int, int, int]
+        """Hop, frames per block and frame averaging for the STFT of data"""
+        if len(data.data) < self.fftsize:
+            # Raised here as a stream would only fail on its worker
+            raise ValueError(
+                'FFT size {0} is longer than the {1} samples in range'
+                .format(self.fftsize, len(data.data))
+            )
+        hop = self.fftsize - int(self.fftsize/4.0)
+        block_frames, average = self.memory_budget.stft_plan(
+            len(data.data), self.fftsize, hop
+        )
+        return hop, block_frames, average
+
+    def _stft_product(self, data):
+        # type: (PlotData) -> STFTProduct
+        """The STFT of the plot data shared by the PSD and spectrogram.
+
+        The Welch PSD is the mean of the same frames used for the
+        spectrogram, so one pass produces both and switching between the
+        tabs does not repeat the FFTs.
+        """
+        hop, block_frames, average = self._stft_plan(data)
+        # The product is dropped whenever the window changes
+        key = (self.fftsize, hop, average)
+        product = self._product
+        if (product is not None and _same_samples(product.data, data.data)
+                and product.key == key):
+            return product
+
+        engine = self._stft_engine_for(data, hop, block_frames)
+        scale = engine.spectrum_scale()
+        spec, mean_power = self._prepare(
+            ('stft',) + key,
+            lambda samples: engine.analyze(samples, scale, average),
+            data.data,
+        )
+        self._product = STFTProduct(
+            data=data.data,
+            key=key,
+            mean_power=mean_power,
+            spec=spec,
+            average=average,
+            image=None,
+            levels=None,
+        )
+        return self._product
 
     def _refresh_psd_plot(self, plot, data):
-        freq_segments, power_d = signal.welch(
-            data.data,
-            fs=self.sample_rate,
-            window=self.window,
-            nfft=self.fftsize,
-            noverlap=self.fftsize/4.0,
-            scaling='density',
-            return_onesided=False,  # Complex only right now so must be False
-        )
-        power_d_log = 10.0*numpy.log10(abs(power_d))
-        freq_segments = numpy.fft.fftshift(freq_segments)
-        power_d_log = numpy.fft.fftshift(power_d_log)
+        product = self._stft_product(data)
+        hop, block_frames, _ = self._stft_plan(data)
+        power_d = product.mean_power * self._get_stft_engine(
+            hop, block_frames
+        ).density_scale(data.sample_rate)
+        numpy.maximum(power_d, 1e-20, out=power_d)
+        power_d_log = 10.0*numpy.log10(power_d)
+        freq_segments = numpy.fft.fftshift(
+            numpy.fft.fftfreq(self.fftsize, 1.0 / data.sample_rate)
+        ) + data.center
         try:
             data_item = plot.plotItem.dataItems[0]
         except IndexError:
@@ -592,21 +2074,63 @@ class PlottingWidget(QWidget):
             raise
         data_item.setData(freq_segments, power_d_log)
 
-    def _refresh_spec_plot(self, plot, data):
-        # Hard code the window function for now
-        freq_segments, time_segments, spec = signal.spectrogram(
+        zoom_item = plot.plotItem.dataItems[1]
+        if self._zoom:
+            zoom_freqs, zoom_psd_log = self._zoom_psd(data)
+            zoom_item.setData(zoom_freqs, zoom_psd_log)
+        else:
+            zoom_item.setData([], [])
+
+    def _zoom_psd(self, data):
+        # type: (PlotData) -> Tuple[numpy.ndarray, numpy.ndarray]
+        band = tuple(f - data.center for f in self._zoom_region.getRegion())
+        key = (band, self.fftsize, data.sample_rate)
+        cached = self._zoom_result
+        if (cached is not None and _same_samples(cached[0], data.data) and
+                cached[1] == key):
+            return cached[2], cached[3]
+
+        window = self.window
+        freqs, power_d = self._prepare(
+            ('zoom',) + key,
+            lambda samples: zoom_psd(samples, data.sample_rate, band, window),
             data.data,
-            fs=self._sample_rate,
-            window=self.window,
-            nfft=self.fftsize,
-            noverlap=self.fftsize/4.0,
-            scaling='spectrum',
-            return_onesided=False,
         )
-        spec = 10.0*numpy.log10(abs(spec))
+        numpy.maximum(power_d, 1e-20, out=power_d)
+        result = (freqs + data.center, 10.0*numpy.log10(power_d))
+        self._zoom_result = (data.data, key) + result
+        return result
+
+    def _refresh_spec_plot(self, plot, data):
+        # The spectrogram is computed a block of frames at a time, if the
+        # full resolution image does not fit in the memory budget adjacent
+        # frames are averaged together
+        product = self._stft_product(data)
+        hop, _, _ = self._stft_plan(data)
+        average = product.average
+        if average > 1:
+            self._fidelity.append(
+                'spectrogram frames averaged x{0}'.format(average)
+            )
+        if product.image is None:
+            # Drawn as uint8 through the lookup table, so pyqtgraph neither
+            # scans the image for levels nor rescales it on every render
+            levels = sample_levels(product.spec)
+            product = self._product = product._replace(
+                image=quantize(product.spec, levels), levels=levels
+            )
+        # Rows are time and columns frequency, the image wants the transpose
+        spec = product.image.T
 
-        freq_segments = numpy.fft.fftshift(freq_segments)
-        spec = numpy.fft.fftshift(spec, axes=0)
+        time_segments = numpy.arange(spec.shape[1], dtype=numpy.float64)
+        time_segments *= average * hop
+        time_segments += (average - 1) * hop / 2.0 + self.fftsize / 2.0
+        time_segments /= data.sample_rate
+        time_segments += data.start_time
+
+        freq_segments = numpy.fft.fftshift(
+            numpy.fft.fftfreq(self.fftsize, 1.0 / data.sample_rate)
+        ) + data.center
 
         f_limits = (freq_segments[0], freq_segments[-1])
         t_limits = (time_segments[0], time_segments[-1])
@@ -628,13 +2152,102 @@ class PlottingWidget(QWidget):
             raise
 
         spec_plot.resetTransform()
-        spec_plot.setImage(spec)
+        spec_plot.setImage(spec, autoLevels=False, levels=(0, 255))
         spec_plot.translate(*pos)
         spec_plot.scale(f_scale, t_scale)
         spec_plot.getViewBox().setLimits(
             xMin=f_limits[0], xMax=f_limits[1],
             yMin=t_limits[0], yMax=t_limits[1]
         )
+        self._mark_bursts(plot, 'horizontal')
+
+    def _get_stft_engine(self, hop, block_frames):
+        # type: (int, int) -> STFTEngine
+        engine = self._stft_engine
+        if engine is None or engine.hop != hop:
+            engine = STFTEngine(self.window, self.fftsize, hop)
+            self._stft_engine = engine
+        engine.block_frames = block_frames
+        return engine
+
+    def _stft_engine_for(self, data, hop, block_frames):
+        # type: (PlotData, int, int) -> STFTEngine
+        """The shared engine for data in memory, a stream is read on a
+        worker so it gets an engine of its own"""
+        if isinstance(data.data, SampleStream):
+            return STFTEngine(self.window, self.fftsize, hop, block_frames)
+        return self._get_stft_engine(hop, block_frames)
+
+    def _persistence(self, data):
+        # type: (PlotData) -> Persistence
+        """Persistence histogram of the plot data, kept until the data or
+        the FFT settings change so a streamed range is not read again"""
+        # Every frame is folded into the histogram as it is computed, so
+        # only one block of frames is ever held
+        hop, block_frames, _ = self._stft_plan(data)
+        key = (self.fftsize, hop, data.sample_rate, self.persist_bins)
+        cached = self._persist
+        if (cached is not None and _same_samples(cached[0], data.data) and
+                cached[1] == key):
+            return cached[2]
+
+        engine = self._stft_engine_for(data, hop, block_frames)
+        scale = engine.density_scale(data.sample_rate)
+        bins = self.persist_bins
+        result = self._prepare(
+            ('persist',) + key,
+            lambda samples: engine.persistence(samples, scale, bins),
+            data.data,
+        )
+        self._persist = (data.data, key, result)
+        return result
+
+    def _refresh_persist_plot(self, plot, data):
+        counts, max_hold, min_hold, db_range = self._persistence(data)
+        density = numpy.log10(counts + 1.0, dtype=numpy.float32)
+
+        freq_segments = numpy.fft.fftshift(
+            numpy.fft.fftfreq(self.fftsize, 1.0 / data.sample_rate)
+        ) + data.center
+        f_scale = data.sample_rate / self.fftsize
+        db_scale = (db_range[1] - db_range[0]) / self.persist_bins
+
+        try:
+            persist_plot = next(plot_item for plot_item in plot.plotItem.items
+                                if isinstance(plot_item, pg.ImageItem))
+        except StopIteration:
+            logger.exception('Persistence plot could not be found!')
+            raise
+
+        persist_plot.resetTransform()
+        persist_plot.setImage(density)
+        persist_plot.translate(freq_segments[0] - f_scale / 2.0, db_range[0])
+        persist_plot.scale(f_scale, db_scale)
+
+        for data_item in plot.plotItem.dataItems:
+            if data_item.name() == 'Max Hold':
+                data_item.setData(freq_segments, max_hold)
+            elif data_item.name() == 'Min Hold':
+                data_item.setData(freq_segments, min_hold)
+
+    def _refresh_const_plot(self, plot, data):
+        counts, extent = density_histogram(data.data, self.const_bins)
+        # Log scale so that sparse outliers are still visible next to the
+        # dense symbol clusters
+        density = numpy.log10(counts + 1.0, dtype=numpy.float32)
+
+        try:
+            const_plot = next(plot_item for plot_item in plot.plotItem.items
+                              if isinstance(plot_item, pg.ImageItem))
+        except StopIteration:
+            logger.exception('Constellation plot could not be found!')
+            raise
+
+        bin_scale = 2.0 * extent / self.const_bins
+        const_plot.resetTransform()
+        const_plot.setImage(density)
+        const_plot.translate(-extent, -extent)
+        const_plot.scale(bin_scale, bin_scale)
 
     @property
     def data_source(self):
@@ -651,6 +2264,49 @@ class PlottingWidget(QWidget):
         self._sample_rate = rate
         self.refresh_plot()
 
+    def set_zoom(self, enabled):
+        # type: (bool) -> None
+        if enabled == self._zoom:
+            return
+        self._zoom = enabled
+        if enabled:
+            # Start on the middle tenth of what is in view
+            x_min, x_max = self.get_plot('psd').plot.viewRange()[0]
+            middle, width = (x_min + x_max) / 2.0, (x_max - x_min) / 20.0
+            self._zoom_region.blockSignals(True)
+            self._zoom_region.setRegion((middle - width, middle + width))
+            self._zoom_region.blockSignals(False)
+            self._zoom_region.show()
+        else:
+            self._zoom_region.hide()
+        self.refresh_plot()
+
+    @property
+    def zoom_band(self):
+        # type: () -> Optional[Tuple[float, float]]
+        """Band selected for the zoom PSD if it is enabled"""
+        if not self._zoom:
+            return None
+        return self._zoom_region.getRegion()
+
+    def set_bursts(self, bursts):
+        # type: (numpy.ndarray) -> None
+        self._bursts = bursts
+        self.refresh_plot()
+
+    def set_memory_budget(self, limit):
+        # type: (Optional[int]) -> None
+        self.memory_budget.limit = limit
+        if self._data_source is not None:
+            # The budget decides whether the range is held in memory
+            self._data_source.reload_file()
+        self.refresh_plot()
+
+    def set_channel(self, shift, up, down):
+        # type: (float, int, int) -> None
+        self._channel = (shift, up, down)
+        self.refresh_plot()
+
     def set_fft(self, size, window):
         old_fftsize = self.fftsize
         old_window = self.window
@@ -658,11 +2314,22 @@ class PlottingWidget(QWidget):
         # Might be possible to use the signal.windows.get_window function
         # but it would require some additional logic to normalize it
         self.window = getattr(signal.windows, window)(size)
+        self._stft_engine = None
+        self._product = None
+        self._zoom_result = None
+        self._persist = None
+        # Work under way is for the old window
+        self.cancel_prepare()
+        self._prepared = None
         try:
             self.refresh_plot()
         except ValueError as err:
             self.fftsize = old_fftsize
             self.window = old_window
+            self._stft_engine = None
+            self._product = None
+            self._zoom_result = None
+            self._persist = None
             try:
                 self.refresh_plot()
             except Exception:  # pylint: disable=W0703
@@ -670,6 +2337,521 @@ class PlottingWidget(QWidget):
             raise err
 
 
+# Magic numbers used to detect compressed captures, gzip includes the
+# deflate method byte as two bytes alone are common in raw int16 captures
+_CODEC_MAGIC = [
+    ('gzip', b'\x1f\x8b\x08'),
+    ('xz', b'\xfd7zXZ\x00'),
+    ('bz2', b'BZh'),
+    ('zstd', b'\x28\xb5\x2f\xfd'),
+]
+
+
+def _cache_path(path, suffix):
+    # type: (str, str) -> str
+    """Location in the user cache directory for data derived from `path`"""
+    cache_dir = os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+        'grplot'
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, digest + suffix)
+
+
+def detect_codec(path, probe_size=1 << 16):
+    # type: (str, int) -> Optional[str]
+    """Return the compression codec of a file or None if it is raw.
+
+    A file whose magic number matches but whose first `probe_size` bytes
+    do not decode is treated as raw.
+    """
+    with open(path, 'rb') as data_file:
+        probe = data_file.read(probe_size)
+    for codec, codec_magic in _CODEC_MAGIC:
+        if probe.startswith(codec_magic):
+            break
+    else:
+        return None
+    decompressor = _new_decompressor(codec)
+    try:
+        decompressor.decompress(probe)
+    except Exception as err:  # pylint: disable=W0703
+        logger.info('%s looks %s compressed but does not decode: %s',
+                    path, codec, str(err))
+        return None
+    return codec
+
+
+def _new_decompressor(codec):
+    # type: (str) -> Any
+    if codec == 'gzip':
+        return zlib.decompressobj(wbits=31)
+    if codec == 'xz':
+        return lzma.LZMADecompressor(lzma.FORMAT_XZ)
+    if codec == 'bz2':
+        return bz2.BZ2Decompressor()
+    if codec == 'zstd':
+        if zstandard is None:
+            raise Exception(
+                'zstd compressed captures require the zstandard package'
+            )
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError('Unknown codec {0}'.format(codec))
+
+
+class RawCapture(object):
+    """Byte level access to an uncompressed capture"""
+    def __init__(self, path):
+        # type: (str) -> None
+        self.path = path
+        self.size = os.stat(path).st_size
+        self.metadata = None  # type: Optional[CaptureMetadata]
+        # (size, mtime) of the file when it was opened
+        self.stat_key = None  # type: Optional[Tuple[int, int]]
+
+    def read(self, offset, size):
+        # type: (int, int) -> bytearray
+        buf = bytearray(size)
+        with open(self.path, 'rb') as data_file:
+            data_file.seek(offset)
+            read_len = data_file.readinto(buf)
+        del buf[read_len:]
+        return buf
+
+    def iter_readinto(self, offset, buf, block_size):
+        # type: (int, memoryview, int) -> Iterator[int]
+        """Fill `buf` from `offset` with sequential reads of `block_size`
+        bytes, yielding the number of bytes filled after each read"""
+        filled = 0
+        with open(self.path, 'rb') as data_file:
+            data_file.seek(offset)
+            while filled < len(buf):
+                read_len = data_file.readinto(
+                    buf[filled:filled + block_size]
+                )
+                if not read_len:
+                    break
+                filled += read_len
+                yield filled
+
+    def iter_read(self, offset, size, block_size):
+        # type: (int, int, int) -> Iterator[bytearray]
+        with open(self.path, 'rb') as data_file:
+            data_file.seek(offset)
+            while size > 0:
+                buf = bytearray(min(block_size, size))
+                read_len = data_file.readinto(buf)
+                if read_len == 0:
+                    break
+                del buf[read_len:]
+                size -= read_len
+                yield buf
+
+
+class CompressedCapture(object):
+    """Byte level access to a compressed capture.
+
+    The first time a capture is opened it is decompressed once to build an
+    index of the compressed offset and decompressed offset of every
+    independently decodable unit (gzip member, xz stream, bzip2 stream or
+    zstd frame).  The index is persisted in the user cache directory so
+    that later reads only decompress from the unit covering the requested
+    range.  Captures written as a single unit still work but every read has
+    to decompress from the start of the file.
+    """
+    def __init__(self, path, codec, block_size=1 << 16):
+        # type: (str, str, int) -> None
+        self.path = path
+        self.codec = codec
+        self._block_size = block_size
+        self._compressed = []  # type: List[int]
+        self._decompressed = []  # type: List[int]
+        self.size = 0
+        self.metadata = None  # type: Optional[CaptureMetadata]
+        # (size, mtime) of the file when it was opened
+        self.stat_key = None  # type: Optional[Tuple[int, int]]
+        if not self._load_index():
+            self._build_index()
+
+    def _index_key(self):
+        stat = os.stat(self.path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime,
+                'codec': self.codec}
+
+    def _load_index(self):
+        # type: () -> bool
+        try:
+            with open(_cache_path(self.path, '.index.json')) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return False
+        if index.get('key') != self._index_key():
+            return False
+        self._compressed = index['compressed']
+        self._decompressed = index['decompressed']
+        self.size = index['length']
+        return True
+
+    def _build_index(self):
+        # type: () -> None
+        logger.info('Building chunk index for %s', self.path)
+        self._compressed = []
+        self._decompressed = []
+        position = 0
+        for unit_offset, chunk in self._iter_units(0):
+            if unit_offset is not None:
+                self._compressed.append(unit_offset)
+                self._decompressed.append(position)
+            position += len(chunk)
+        self.size = position
+
+        index = {
+            'key': self._index_key(),
+            'compressed': self._compressed,
+            'decompressed': self._decompressed,
+            'length': self.size,
+        }
+        try:
+            with open(_cache_path(self.path, '.index.json'), 'w') as idx_file:
+                json.dump(index, idx_file)
+        except OSError as err:
+            logger.warning('Unable to persist chunk index: %s', str(err))
+
+    def _iter_units(self, offset):
+        # type: (int) -> Iterator[Tuple[Optional[int], bytes]]
+        """Decompress from `offset` which must be the start of a unit.
+
+        Yields (unit_offset, data) where unit_offset is the compressed offset
+        when a new unit starts and None otherwise.
+        """
+        with open(self.path, 'rb') as data_file:
+            data_file.seek(offset)
+            decompressor = None
+            pending = b''
+            position = offset  # Compressed offset of pending[0]
+            while True:
+                if not pending:
+                    pending = data_file.read(self._block_size)
+                    if not pending:
+                        break
+                if decompressor is None:
+                    # xz allows zero padding between concatenated streams
+                    stripped = pending.lstrip(b'\x00')
+                    if self.codec == 'xz' and len(stripped) != len(pending):
+                        position += len(pending) - len(stripped)
+                        pending = stripped
+                        continue
+                    decompressor = _new_decompressor(self.codec)
+                    yield position, b''
+                consumed = len(pending)
+                chunk = decompressor.decompress(pending)
+                if decompressor.eof:
+                    pending = decompressor.unused_data
+                    position += consumed - len(pending)
+                    decompressor = None
+                else:
+                    position += consumed
+                    pending = b''
+                if chunk:
+                    yield None, chunk
+
+    def iter_read(self, offset, size, block_size):
+        # type: (int, int, int) -> Iterator[bytearray]
+        """Yield the decompressed bytes [offset, offset+size) in blocks of
+        `block_size` bytes"""
+        unit = bisect.bisect_right(self._decompressed, offset) - 1
+        if unit < 0 or size <= 0:
+            return
+        position = self._decompressed[unit]
+        buf = bytearray()
+        for _, chunk in self._iter_units(self._compressed[unit]):
+            if position + len(chunk) <= offset:
+                position += len(chunk)
+                continue
+            skip = max(0, offset - position)
+            position += len(chunk)
+            buf += chunk[skip:skip + size]
+            size -= min(size, len(chunk) - skip)
+            while len(buf) >= block_size:
+                yield buf[:block_size]
+                del buf[:block_size]
+            if size == 0:
+                break
+        if buf:
+            yield buf
+
+    def iter_readinto(self, offset, buf, block_size):
+        # type: (int, memoryview, int) -> Iterator[int]
+        """Fill `buf` with the decompressed bytes from `offset`, yielding
+        the number of bytes filled after each block"""
+        filled = 0
+        for block in self.iter_read(offset, len(buf), block_size):
+            buf[filled:filled + len(block)] = block
+            filled += len(block)
+            yield filled
+
+    def read(self, offset, size):
+        # type: (int, int) -> bytearray
+        buf = bytearray(size)
+        filled = 0
+        for filled in self.iter_readinto(offset, memoryview(buf),
+                                         16*self._block_size):
+            pass
+        del buf[filled:]
+        return buf
+
+
+# Serialization tags of GNU Radio polymorphic types (pmt_serial_tags.h)
+_PST_TRUE = 0x00
+_PST_FALSE = 0x01
+_PST_SYMBOL = 0x02
+_PST_INT32 = 0x03
+_PST_DOUBLE = 0x04
+_PST_COMPLEX = 0x05
+_PST_NULL = 0x06
+_PST_PAIR = 0x07
+_PST_VECTOR = 0x08
+_PST_DICT = 0x09
+_PST_UNIFORM_VECTOR = 0x0a
+_PST_UINT64 = 0x0b
+_PST_TUPLE = 0x0c
+_PST_INT64 = 0x0d
+
+_PMT_SCALARS = {
+    _PST_INT32: struct.Struct('>i'),
+    _PST_DOUBLE: struct.Struct('>d'),
+    _PST_COMPLEX: struct.Struct('>dd'),
+    _PST_UINT64: struct.Struct('>Q'),
+    _PST_INT64: struct.Struct('>q'),
+}
+
+# `type` of a file_meta_sink header mapped to the (real, complex) data type,
+# complex integer items are interleaved and have no matching numpy type.
+# GNU Radio writes `long` items as 4 bytes
+_META_ITEM_TYPES = {
+    0: ('int8', None),
+    1: ('int16', None),
+    2: ('int32', None),
+    3: ('int32', None),
+    4: ('int64', None),
+    5: ('float32', 'complex64'),
+    6: ('float64', 'complex128'),
+}
+
+_PMTPair = namedtuple('_PMTPair', ['car', 'cdr'])
+
+
+def _pmt_read(buf, offset):
+    # type: (bytes, int) -> Tuple[Any, int]
+    """Deserialize one PMT from `buf` at `offset`, returning it and the
+    offset after it.  Pairs and dicts are both returned as `_PMTPair`"""
+    tag = buf[offset]
+    offset += 1
+    if tag in _PMT_SCALARS:
+        scalar = _PMT_SCALARS[tag]
+        value = scalar.unpack_from(buf, offset)
+        offset += scalar.size
+        if tag == _PST_COMPLEX:
+            return complex(*value), offset
+        return value[0], offset
+    if tag == _PST_TRUE:
+        return True, offset
+    if tag == _PST_FALSE:
+        return False, offset
+    if tag == _PST_NULL:
+        return None, offset
+    if tag == _PST_SYMBOL:
+        length, = struct.unpack_from('>H', buf, offset)
+        offset += 2
+        if offset + length > len(buf):
+            raise ValueError('Truncated PMT symbol')
+        return buf[offset:offset + length].decode('utf-8'), offset + length
+    if tag in (_PST_PAIR, _PST_DICT):
+        car, offset = _pmt_read(buf, offset)
+        cdr, offset = _pmt_read(buf, offset)
+        return _PMTPair(car, cdr), offset
+    if tag in (_PST_VECTOR, _PST_TUPLE):
+        length, = struct.unpack_from('>I', buf, offset)
+        offset += 4
+        items = []
+        for _ in range(length):
+            item, offset = _pmt_read(buf, offset)
+            items.append(item)
+        return tuple(items), offset
+    raise ValueError('Unsupported PMT tag 0x{0:02x}'.format(tag))
+
+
+def _pmt_dict(pmt):
+    # type: (Any) -> Dict[Any, Any]
+    """Convert a deserialized PMT dict, a list of (key . value) pairs"""
+    items = {}
+    while isinstance(pmt, _PMTPair):
+        if isinstance(pmt.car, _PMTPair):
+            items[pmt.car.car] = pmt.car.cdr
+        pmt = pmt.cdr
+    return items
+
+
+MetaSegment = namedtuple('MetaSegment', [
+    'sample', 'samples', 'rx_time', 'sample_rate',
+])
+
+
+class CaptureMetadata(object):
+    """Segment index read from a GNU Radio `file_meta_sink` detached header.
+
+    `file_meta_sink` writes a new header whenever the rate or time tag
+    changes or a segment fills up.  Each one is kept as a `MetaSegment`
+    holding its first sample in the payload, its length, the `rx_time` of
+    that first sample and its sample rate, so a time or segment maps to a
+    sample offset by bisection without touching the payload.  Segments
+    without any samples are dropped.
+    """
+    def __init__(self, segments, data_type=None, extras=None):
+        # type: (List[MetaSegment], Optional[str], Optional[Dict]) -> None
+        self.segments = segments
+        self.data_type = data_type
+        self.extras = extras or {}
+        self._times = [segment.rx_time for segment in segments]
+
+    @classmethod
+    def parse(cls, buf):
+        # type: (bytes) -> CaptureMetadata
+        segments = []  # type: List[MetaSegment]
+        data_type = None
+        extras = None
+        offset = 0
+        payload = 0
+        # Bytes per sample, the header `size` is per item which may be a
+        # vector of samples
+        sample_size = None  # type: Optional[int]
+        while offset < len(buf):
+            try:
+                header, header_end = _pmt_read(buf, offset)
+                fields = _pmt_dict(header)
+                header_len = fields['strt']
+                if header_len < header_end - offset:
+                    raise ValueError(
+                        'Data start {0} is inside the header'.format(
+                            header_len
+                        )
+                    )
+                # Extras follow the fixed fields, 149 bytes as written by
+                # file_meta_sink, up to the data start `strt`
+                if extras is None and header_len > header_end - offset:
+                    extras = _pmt_dict(_pmt_read(buf, header_end)[0])
+                seconds, fraction = fields['rx_time']
+                item_type = _META_ITEM_TYPES.get(fields['type'])
+                item_size = fields['size']
+                if item_size <= 0:
+                    raise ValueError('Bad item size {0}'.format(item_size))
+                seg_bytes = fields['bytes']
+                rate = fields['rx_rate']
+                complex_items = fields['cplx']
+            except (KeyError, IndexError, TypeError, ValueError,
+                    struct.error) as err:
+                # A header still being written by a running flowgraph
+                logger.warning(
+                    'Stopped reading metadata at byte %d: %s', offset, err
+                )
+                break
+            if sample_size is None:
+                if item_type is not None:
+                    data_type = item_type[int(bool(complex_items))]
+                if (data_type is not None and
+                        item_size % numpy.dtype(data_type).itemsize):
+                    logger.warning(
+                        'Header item size %d does not hold %s samples',
+                        item_size, data_type
+                    )
+                    data_type = None
+                if data_type is None:
+                    logger.warning(
+                        'Header item type %s is not supported, set the '
+                        'data type by hand', fields['type']
+                    )
+                    sample_size = item_size
+                else:
+                    sample_size = numpy.dtype(data_type).itemsize
+            if item_size % sample_size:
+                logger.warning('Stopped reading metadata at byte %d: item '
+                               'size changed to %d', offset, item_size)
+                break
+            if seg_bytes >= item_size:
+                segments.append(MetaSegment(
+                    payload // sample_size, seg_bytes // sample_size,
+                    seconds + fraction, rate
+                ))
+            payload += seg_bytes
+            offset += header_len
+        if not segments:
+            raise ValueError('Header does not describe any samples')
+        return cls(segments, data_type, extras)
+
+    @property
+    def sample_rate(self):
+        # type: () -> float
+        return self.segments[0].sample_rate
+
+    @property
+    def start_time(self):
+        # type: () -> float
+        return self.segments[0].rx_time
+
+    def segment_at(self, rx_time):
+        # type: (float) -> int
+        """Index of the segment recorded at `rx_time`"""
+        return max(bisect.bisect_right(self._times, rx_time) - 1, 0)
+
+    def sample_at(self, rx_time):
+        # type: (float) -> int
+        """Payload sample recorded at `rx_time`, times between segments
+        clamp to the end of the earlier segment"""
+        segment = self.segments[self.segment_at(rx_time)]
+        offset = int(round((rx_time - segment.rx_time) * segment.sample_rate))
+        return segment.sample + min(max(offset, 0), segment.samples - 1)
+
+
+def find_header(path):
+    # type: (str) -> Optional[str]
+    """Detached header of a capture, `file.dat.hdr` or `file.hdr`"""
+    for header_path in (path + '.hdr', os.path.splitext(path)[0] + '.hdr'):
+        if header_path != path and os.path.isfile(header_path):
+            return header_path
+    return None
+
+
+def load_metadata(path):
+    # type: (str) -> Optional[CaptureMetadata]
+    """Read the detached header of a capture if there is a usable one"""
+    header_path = find_header(path)
+    if header_path is None:
+        return None
+    with open(header_path, 'rb') as header_file:
+        buf = header_file.read()
+    try:
+        return CaptureMetadata.parse(buf)
+    except ValueError as err:
+        logger.warning('Ignoring header %s: %s', header_path, err)
+        return None
+
+
+def open_capture(path):
+    # type: (str) -> Any
+    """Open a capture for byte level access, compressed captures are
+    detected from their magic number"""
+    stat = os.stat(path)
+    codec = detect_codec(path)
+    if codec is None:
+        capture = RawCapture(path)
+    else:
+        capture = CompressedCapture(path, codec)
+    capture.metadata = load_metadata(path)
+    capture.stat_key = (stat.st_size, stat.st_mtime_ns)
+    return capture
+
+
 class DataSource(object):
     """Data interface class for plotting"""
     def __init__(self, path=None, data_type='complex64'):
@@ -678,14 +2860,23 @@ class DataSource(object):
         self._data_type = data_type
         self.source_path = None  # type: Optional[str]
         self.data = None
+        self._capture = None  # type: Any
+        # When set, ranges too large to plot within the budget are not read
+        # into `data` and have to be consumed through `iter_chunks`
+        self.memory_budget = None  # type: Optional[MemoryBudget]
+        # Sample rate from the capture header, None if it has no header
+        self.sample_rate = None  # type: Optional[float]
+        # Called before a synchronous reload so any other load of the
+        # source can be abandoned
+        self.reload_cb = None
         self._start = 0  # type: int
         self._end = 0  # type: int
         if path is not None:
             self.load_file(path, True)
 
-    def _file_range(self, file_len, full_scale=False):
-        # type: (int, bool) -> Tuple[int, int]
-        data_size = numpy.dtype(self._data_type).itemsize
+    def _file_range(self, file_len, full_scale=False, data_type=None):
+        # type: (int, bool, Any) -> Tuple[int, int]
+        data_size = numpy.dtype(data_type or self._data_type).itemsize
 
         remainder_bytes = file_len % data_size
         if remainder_bytes != 0:
@@ -718,38 +2909,160 @@ class DataSource(object):
 
         return new_start, new_end
 
-    def load_file(self, path, reset=False):
-        # type: (str, bool) -> None
-        """Update the source data file return if the ui needs to be updated"""
-        with open(path, 'rb') as data_file:
-            file_len = os.fstat(data_file.fileno()).st_size  # type: int
+    def load_file(self, path, reset=False, read=True):
+        # type: (str, bool, bool) -> None
+        """Update the source data file return if the ui needs to be updated
+
+        If `read` is False only the file range is validated and the data is
+        left to be consumed through `iter_chunks`.
+        """
+        capture, new_start, new_end = self.plan_load(path, reset)
+        data_type = self.load_type(path, capture)
+
+        data = self.data
+        if read:
+            data = None
+            if self.fits_budget(new_start, new_end, data_type):
+                data = numpy.empty(new_end-new_start, data_type)
+                for _ in self.iter_read_range(capture, new_start, data):
+                    pass
+            else:
+                logger.info('Range exceeds the memory budget, streaming it')
+
+        # The data was loaded apply the state
+        self.apply_load(path, capture, new_start, new_end, data)
+
+    def plan_load(self, path, reset=False):
+        # type: (str, bool) -> Tuple[Any, int, int]
+        """Open `path` and work out the sample range to load from it.  This
+        does not change the state of the source.  The open capture and its
+        header are reused while the file is unchanged."""
+        capture = self._capture
+        stat = os.stat(path)
+        if (capture is None or capture.path != path or
+                capture.stat_key != (stat.st_size, stat.st_mtime_ns)):
+            capture = open_capture(path)
+        file_len = capture.size  # type: int
+
+        new_start, new_end = self._file_range(
+            file_len, reset, self.load_type(path, capture)
+        )
 
-            new_start, new_end = self._file_range(file_len, reset)
+        limits_changed = (new_start, new_end) != (self._start, self._end)
+        if limits_changed and not reset:
+            # Only log if limits changed unexpectedly
+            logger.warning(
+                'Limits out of range [%d, %d] adjusted to [%d, %d]',
+                self._start, self._end, new_start, new_end
+            )
+        return capture, new_start, new_end
+
+    def load_type(self, path, capture):
+        # type: (str, Any) -> Any
+        """Data type to read a planned load with.  A header only sets the
+        type when the file is first opened so it can still be overridden"""
+        metadata = capture.metadata
+        if (path != self.source_path and metadata is not None and
+                metadata.data_type is not None):
+            return getattr(numpy, metadata.data_type)
+        return self._data_type
 
-            limits_changed = (new_start, new_end) != (self._start, self._end)
-            if limits_changed and not reset:
-                # Only log if limits changed unexpectedly
-                logger.warning(
-                    'Limits out of range [%d, %d] adjusted to [%d, %d]',
-                    self._start, self._end, new_start, new_end
-                )
+    def fits_budget(self, start, end, data_type=None):
+        # type: (int, int, Any) -> bool
+        """If the range can be held in `data` under the memory budget"""
+        if self.memory_budget is None:
+            return True
+        data_size = numpy.dtype(data_type or self._data_type).itemsize
+        return self.memory_budget.fits(
+            (end-start) * (data_size + _PLOT_BYTES_PER_SAMPLE)
+        )
 
-            data_size = numpy.dtype(self._data_type).itemsize
-            data_file.seek(new_start*data_size)
-            self.data = numpy.fromfile(
-                data_file, self._data_type, new_end-new_start
+    def iter_read_range(self, capture, start, data, chunk_size=1 << 22):
+        # type: (Any, int, numpy.ndarray, int) -> Iterator[int]
+        """Fill `data` from sample `start` of a capture with sequential reads
+        of `chunk_size` samples, yielding the samples filled so far"""
+        data_size = data.itemsize
+        buf = memoryview(data.view(numpy.uint8))
+        for filled in capture.iter_readinto(start*data_size, buf,
+                                            chunk_size*data_size):
+            yield filled // data_size
+
+    def apply_load(self, path, capture, start, end, data):
+        # type: (str, Any, int, int, Optional[numpy.ndarray]) -> None
+        """Switch the source to a planned load"""
+        if path != self.source_path:
+            metadata = capture.metadata
+            self._data_type = self.load_type(path, capture)
+            self.sample_rate = None if metadata is None else (
+                metadata.sample_rate
             )
-
-            # The data was loaded apply the state
-            self._start = new_start
-            self._end = new_end
-            self.source_path = path
+        self.data = data
+        self._start = start
+        self._end = end
+        self.source_path = path
+        self._capture = capture
+
+    def iter_chunks(self, chunk_size=1 << 22):
+        # type: (int) -> Iterator[numpy.ndarray]
+        """Read the [start, end) range from the source file in chunks of at
+        most `chunk_size` samples.  This does not touch `data`"""
+        if self._capture is None:
+            return
+        data_size = numpy.dtype(self._data_type).itemsize
+        for block in self._capture.iter_read(
+                self._start*data_size, (self._end - self._start)*data_size,
+                chunk_size*data_size):
+            yield numpy.frombuffer(block, self._data_type,
+                                   len(block) // data_size)
+
+    def export(self, out_path, out_type=None):
+        # type: (str, Any) -> int
+        """Write the [start, end) range to a new file, see `export_range`"""
+        if self.source_path is None:
+            raise ValueError('No file loaded to export from')
+        return export_range(self.source_path, out_path, self._start,
+                            self._end, self._data_type, out_type)
 
     def reload_file(self):
         """Reprocess data file"""
+        if self.reload_cb is not None:
+            self.reload_cb()
         if self.source_path is not None:
             self.load_file(self.source_path)
 
+    @property
+    def capture(self):
+        return self._capture
+
+    @property
+    def metadata(self):
+        # type: () -> Optional[CaptureMetadata]
+        """Segment index from the header of the current capture"""
+        if self._capture is None:
+            return None
+        return self._capture.metadata
+
+    def _seek(self, start, length):
+        # type: (int, Optional[int]) -> None
+        if length is None:
+            length = self._end - self._start
+        self.set_range(start, start + max(length, 1))
+
+    def seek_time(self, rx_time, length=None):
+        # type: (float, Optional[int]) -> None
+        """Move the range to start at the sample recorded at `rx_time`,
+        keeping its length unless `length` samples are given"""
+        if self.metadata is None:
+            raise ValueError('Capture has no header to seek by time')
+        self._seek(self.metadata.sample_at(rx_time), length)
+
+    def seek_segment(self, index, length=None):
+        # type: (int, Optional[int]) -> None
+        """Move the range to start at header segment `index`"""
+        if self.metadata is None:
+            raise ValueError('Capture has no header to seek by segment')
+        self._seek(self.metadata.segments[index].sample, length)
+
     @property
     def data_type(self):
         return self._data_type
@@ -793,24 +3106,661 @@ class DataSource(object):
             self._end = old_end
             raise
 
+    def set_range(self, start, end):
+        # type: (int, int) -> None
+        """Move both ends of the range with a single reload"""
+        old_range = (self._start, self._end)
+        try:
+            self._start, self._end = start, end
+            self.reload_file()
+        except Exception:
+            self._start, self._end = old_range
+            raise
+
     def time_range(self, sample_rate):
         t_range = numpy.linspace(self.start, self.end, len(self.data), True)
         t_range /= sample_rate
         return t_range
 
 
+class BurstDetector(object):
+    """Finds bursts in a stream of samples with a power threshold.
+
+    `update` reduces each chunk to the mean power of `block_size` sample
+    blocks, or with `band` (Hz) to the energy of the Blackman windowed FFT
+    bins of each block inside the band.  Samples that do not fill a block
+    are carried to the next chunk.  `bursts` smooths the block powers with
+    a moving average of `average` blocks, a burst starts `threshold` dB
+    above the median power and ends once the power falls `hysteresis` dB
+    below that.  Burst edges are resolved to a block.
+    """
+    def __init__(self,
+                 block_size=128,  # type: int
+                 average=4,  # type: int
+                 threshold=10.0,  # type: float
+                 hysteresis=3.0,  # type: float
+                 band=None,  # type: Optional[Tuple[float, float]]
+                 sample_rate=1.0,  # type: float
+                 ):
+        # type: (...) -> None
+        self.block_size = block_size
+        self.average = average
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self._mask = None  # type: Optional[numpy.ndarray]
+        if band is not None:
+            # Keeps the leakage of strong signals out of the band
+            self._window = signal.windows.blackman(block_size)
+            freqs = numpy.fft.fftfreq(block_size, 1.0 / sample_rate)
+            self._mask = (freqs >= min(band)) & (freqs <= max(band))
+            if not self._mask.any():
+                raise ValueError('Band is narrower than a block bin')
+        self.reset()
+
+    def reset(self):
+        # type: () -> None
+        self._power = []  # type: List[numpy.ndarray]
+        self._carry = numpy.empty(0)
+        self.samples = 0
+
+    def update(self, chunk):
+        # type: (numpy.ndarray) -> None
+        self.samples += len(chunk)
+        if len(self._carry):
+            chunk = numpy.concatenate((self._carry, chunk))
+        blocks = len(chunk) // self.block_size
+        self._carry = chunk[blocks * self.block_size:]
+        if not blocks:
+            return
+        chunk = chunk[:blocks * self.block_size].reshape(blocks, -1)
+        if not numpy.iscomplexobj(chunk):
+            # Squaring integer samples would overflow
+            chunk = chunk.astype(numpy.float32)
+        if self._mask is None:
+            power = numpy.abs(chunk) ** 2
+        else:
+            spectrum = sp_fft.fft(chunk * self._window, axis=1)
+            power = numpy.abs(spectrum[:, self._mask]) ** 2
+        self._power.append(power.mean(axis=1, dtype=numpy.float32))
+
+    def bursts(self):
+        # type: () -> numpy.ndarray
+        """[start, end) samples of each burst so far as an (N, 2) array"""
+        if not self._power:
+            return numpy.empty((0, 2), numpy.int64)
+        power = numpy.concatenate(self._power)
+        if self.average > 1:
+            power = numpy.convolve(
+                power, numpy.full(self.average, 1.0 / self.average), 'same'
+            )
+        floor = max(float(numpy.median(power)),
+                    numpy.finfo(numpy.float32).tiny)
+        on = power > floor * 10.0 ** (self.threshold / 10.0)
+        off = power < floor * 10.0 ** (
+            (self.threshold - self.hysteresis) / 10.0
+        )
+        # Carry the last on or off decision forward over the blocks between
+        # the two thresholds
+        decided = numpy.where(on | off, numpy.arange(len(power)), 0)
+        numpy.maximum.accumulate(decided, out=decided)
+        active = numpy.zeros(len(power) + 2, numpy.int8)
+        active[1:-1] = on[decided]
+        edges = numpy.diff(active)
+        starts = numpy.flatnonzero(edges == 1)
+        ends = numpy.flatnonzero(edges == -1)
+        bursts = numpy.stack((starts, ends), axis=1) * self.block_size
+        numpy.minimum(bursts, self.samples, out=bursts)
+        return bursts.astype(numpy.int64)
+
+
+_BURST_CACHE = LRUCache()
+
+
+def find_bursts(path,  # type: str
+                data_type='complex64',  # type: str
+                sample_rate=1.0,  # type: float
+                chunk_size=1 << 22,  # type: int
+                cancelled=None,  # type: Optional[Any]
+                **detector_args  # type: Any
+                ):
+    # type: (...) -> Optional[numpy.ndarray]
+    """Bursts of a whole capture from a `BurstDetector`.
+
+    The result is cached in memory and persisted in the user cache
+    directory, keyed on the file and detector settings.  `cancelled` is
+    checked between chunks, None is returned if it becomes True.
+    """
+    source = DataSource(data_type=data_type)
+    source.load_file(path, True, read=False)
+    stat = os.stat(path)
+    key = {
+        'size': stat.st_size, 'mtime': stat.st_mtime,
+        'data_type': numpy.dtype(source.data_type).name,
+        'sample_rate': sample_rate, 'detector': detector_args,
+    }
+    cache_key = (os.path.abspath(path), json.dumps(key, sort_keys=True))
+    bursts = _BURST_CACHE.get(cache_key)
+    if bursts is not None:
+        return bursts
+
+    cache_file = _cache_path(path, '.bursts.json')
+    try:
+        with open(cache_file) as burst_file:
+            cached = json.load(burst_file)
+        if cached.get('key') == json.loads(cache_key[1]):
+            bursts = numpy.array(cached['bursts'], numpy.int64).reshape(-1, 2)
+    except (OSError, ValueError):
+        pass
+
+    if bursts is None:
+        detector = BurstDetector(sample_rate=sample_rate, **detector_args)
+        for chunk in source.iter_chunks(chunk_size):
+            if cancelled is not None and cancelled():
+                return None
+            detector.update(chunk)
+        bursts = detector.bursts()
+        try:
+            with open(cache_file, 'w') as burst_file:
+                json.dump({'key': key, 'bursts': bursts.tolist()}, burst_file)
+        except OSError as err:
+            logger.warning('Unable to persist burst index: %s', str(err))
+
+    _BURST_CACHE.put(cache_key, bursts)
+    return bursts
+
+
+def burst_range(start, end, length, samples):
+    # type: (int, int, int, int) -> Tuple[int, int]
+    """Range of at least `length` samples centered on the burst
+    [start, end), kept inside a capture of `samples` samples"""
+    length = min(max(end - start, length), samples)
+    start = min(max((start + end - length) // 2, 0), samples - length)
+    return start, start + length
+
+
+def _copy_range(src_path, dst_path, offset, count):
+    # type: (str, str, int, int) -> int
+    """Copy `count` bytes from `offset` of one file to a new file inside the
+    kernel.  `copy_file_range` is tried first then `sendfile`, falling back
+    to reads and writes where neither is supported"""
+    use_copy_range = hasattr(os, 'copy_file_range')
+    use_sendfile = hasattr(os, 'sendfile')
+    copied = 0
+    with open(src_path, 'rb') as src, open(dst_path, 'wb', 0) as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        while copied < count:
+            size = min(count - copied, 1 << 30)
+            try:
+                if use_copy_range:
+                    sent = os.copy_file_range(src_fd, dst_fd, size,
+                                              offset + copied)
+                elif use_sendfile:
+                    sent = os.sendfile(dst_fd, src_fd, offset + copied, size)
+                else:
+                    src.seek(offset + copied)
+                    sent = dst.write(src.read(min(size, 1 << 24)))
+            except OSError as err:
+                if err.errno not in (errno.EXDEV, errno.ENOSYS,
+                                     errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+                if use_copy_range:
+                    use_copy_range = False
+                elif use_sendfile:
+                    use_sendfile = False
+                else:
+                    raise
+                continue
+            if sent == 0:
+                break
+            copied += sent
+    return copied
+
+
+def export_range(path, out_path, start, end, data_type='complex64',
+                 out_type=None, chunk_size=1 << 22):
+    # type: (str, str, int, int, Any, Any, int) -> int
+    """Write samples [start, end) of a capture to a new file.
+
+    Uncompressed captures are copied by the kernel when the type is kept,
+    otherwise the range is read `chunk_size` samples at a time and converted
+    with a plain cast to `out_type`.  Returns the number of samples written.
+    """
+    if os.path.exists(out_path) and os.path.samefile(path, out_path):
+        raise ValueError('Can not export {0} over itself'.format(path))
+    in_type = numpy.dtype(data_type)
+    out_type = in_type if out_type is None else numpy.dtype(out_type)
+    if in_type.kind == 'c' and out_type.kind != 'c':
+
+        raise ValueError(
+            'Can not convert {0} samples to {1}'.format(in_type, out_type)
+        )
+    capture = open_capture(path)
+    end = min(end, capture.size // in_type.itemsize)
+    if start < 0 or start >= end:
+        raise ValueError('Empty export range [{0}, {1})'.format(start, end))
+
+    offset = start * in_type.itemsize
+    count = (end - start) * in_type.itemsize
+    if out_type == in_type and isinstance(capture, RawCapture):
+        return _copy_range(path, out_path, offset, count) // in_type.itemsize
+
+    with open(out_path, 'wb') as out_file:
+        for block in capture.iter_read(offset, count,
+                                       chunk_size * in_type.itemsize):
+            if out_type == in_type:
+                out_file.write(block)
+                continue
+            samples = numpy.frombuffer(
+                block, in_type, len(block) // in_type.itemsize
+            )
+            samples.astype(out_type).tofile(out_file)
+    return end - start
+
+
+# Extensions of compressed captures, dropped from the names of exports
+# as those are written raw
+_CODEC_EXTENSIONS = {'.gz', '.xz', '.bz2', '.zst', '.zstd'}
+
+
+def export_name(path, compressed):
+    # type: (str, bool) -> Tuple[str, str]
+    """Stem and extension to name exports of `path` with"""
+    stem, ext = os.path.splitext(path)
+    if compressed and ext.lower() in _CODEC_EXTENSIONS:
+        stem, ext = os.path.splitext(stem)
+    return stem, ext
+
+
+def export_ranges(path, ranges, output='{stem}_{start}_{end}{ext}',
+                  data_type='complex64', out_type=None):
+    # type: (str, List[Tuple[int, int]], str, Any, Any) -> List[str]
+    """Export each [start, end) range of a capture to its own file.
+
+    `output` is formatted with the `stem` and `ext` of the capture name,
+    without the extension of a compressed capture, and the `start` and
+    `end` of the range.
+    """
+    stem, ext = export_name(os.path.basename(path),
+                            detect_codec(path) is not None)
+    written = []
+    for start, end in ranges:
+        out_path = output.format(stem=stem, ext=ext, start=start, end=end)
+        export_range(path, out_path, start, end, data_type, out_type)
+        written.append(out_path)
+    return written
+
+
+CaptureSummary = namedtuple('CaptureSummary', [
+    'path', 'mtime', 'size', 'data_type', 'sample_rate', 'length',
+    'duration', 'band_power', 'peaks', 'bursts',
+])
+
+
+def _capture_settings(path, data_type, sample_rate):
+    # type: (str, str, float) -> Tuple[str, float]
+    """Data type and sample rate a capture is summarized with"""
+    metadata = load_metadata(path)
+    if metadata is not None:
+        if metadata.data_type is not None:
+            data_type = metadata.data_type
+        if metadata.sample_rate is not None:
+            sample_rate = metadata.sample_rate
+    return numpy.dtype(data_type).name, sample_rate
+
+
+def summarize_capture(path, data_type='complex64', sample_rate=8000.0,
+                      bands=16, fft_size=1024, num_peaks=5,
+                      burst_threshold=10.0, chunk_size=1 << 22):
+    # type: (str, str, float, int, int, int, float, int) -> CaptureSummary
+    """Compute a compact summary of a capture in a single chunked pass.
+
+    The band power profile is the Welch PSD averaged into `bands` equal
+    width bands spanning [-fs/2, fs/2) in dB.  Bursts are counted by a
+    `BurstDetector` on the power of `fft_size` sample blocks, a burst starts
+    when a block is `burst_threshold` dB above the median block power.  The
+    data type and sample rate of a capture header take precedence.
+    """
+    stat = os.stat(path)
+    source = DataSource(data_type=data_type)
+    source.load_file(path, True, read=False)
+    data_type = numpy.dtype(source.data_type).name
+    if source.sample_rate is not None:
+        sample_rate = source.sample_rate
+
+    psd_sum = numpy.zeros(fft_size)
+    psd_weight = 0
+    detector = BurstDetector(block_size=fft_size, average=1,
+                             threshold=burst_threshold)
+    for chunk in source.iter_chunks(chunk_size):
+        nperseg = min(fft_size, len(chunk))
+        if nperseg == fft_size:
+            _, chunk_psd = signal.welch(
+                chunk, fs=sample_rate, nperseg=fft_size,
+                scaling='density', return_onesided=False,
+            )
+            psd_sum += chunk_psd * len(chunk)
+            psd_weight += len(chunk)
+        detector.update(chunk)
+
+    band_power = []  # type: List[float]
+    peaks = []  # type: List[float]
+    if psd_weight:
+        psd = numpy.fft.fftshift(psd_sum / psd_weight)
+        freqs = numpy.fft.fftshift(numpy.fft.fftfreq(fft_size, 1/sample_rate))
+        floor = numpy.finfo(numpy.float64).tiny
+        band_power = [
+            float(10.0 * numpy.log10(max(band.mean(), floor)))
+            for band in numpy.array_split(psd, bands)
+        ]
+        peak_idx, _ = signal.find_peaks(psd)
+        peak_idx = peak_idx[numpy.argsort(psd[peak_idx])[::-1][:num_peaks]]
+        peaks = [float(freqs[idx]) for idx in peak_idx]
+
+    bursts = len(detector.bursts())
+
+    return CaptureSummary(
+        path=os.path.abspath(path),
+        mtime=stat.st_mtime,
+        size=stat.st_size,
+        data_type=data_type,
+        sample_rate=sample_rate,
+        length=source.end,
+        duration=source.end / sample_rate,
+        band_power=band_power,
+        peaks=peaks,
+        bursts=bursts,
+    )
+
+
+class CaptureCatalog(object):
+    """SQLite backed index of capture summaries"""
+    def __init__(self, index_path):
+        # type: (str) -> None
+        self.index_path = index_path
+        self._db = sqlite3.connect(index_path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS captures ('
+            'path TEXT PRIMARY KEY, mtime REAL, size INTEGER, '
+            'data_type TEXT, sample_rate REAL, length INTEGER, '
+            'duration REAL, band_power TEXT, peaks TEXT, bursts INTEGER)'
+        )
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def _is_current(self, path, stat, data_type, sample_rate):
+        row = self._db.execute(
+            'SELECT mtime, size, data_type, sample_rate FROM captures '
+            'WHERE path = ?', (path,)
+        ).fetchone()
+        return row == (stat.st_mtime, stat.st_size, data_type, sample_rate)
+
+    def _store(self, summary):
+        # type: (CaptureSummary) -> None
+        values = summary._replace(
+            band_power=json.dumps(summary.band_power),
+            peaks=json.dumps(summary.peaks),
+        )
+        self._db.execute(
+            'INSERT OR REPLACE INTO captures VALUES (?,?,?,?,?,?,?,?,?,?)',
+            tuple(values)
+        )
+
+    def scan(self, root, data_type='complex64', sample_rate=8000.0,
+             pattern='*', jobs=None, **summary_args):
+        # type: (str, str, float, str, Optional[int], **Any) -> Tuple[int, int]
+        """Summarize all captures under `root` using a process pool.
+
+        Files whose mtime, size and settings match the index are skipped,
+        entries for files that have been removed are dropped.  Returns the
+        number of files scanned and skipped.
+        """
+        root = os.path.abspath(root)
+        index_path = os.path.abspath(self.index_path)
+        found = set()
+        pending = []
+        for dir_path, _, file_names in os.walk(root):
+            # Detached headers are part of their capture
+            headers = {find_header(os.path.join(dir_path, file_name))
+                       for file_name in file_names}
+            for file_name in fnmatch.filter(file_names, pattern):
+                path = os.path.join(dir_path, file_name)
+                if path == index_path or path in headers:
+                    continue
+                found.add(path)
+                if not self._is_current(
+                        path, os.stat(path),
+                        *_capture_settings(path, data_type, sample_rate)):
+                    pending.append(path)
+
+        stale = [
+            path for (path,) in
+            self._db.execute('SELECT path FROM captures').fetchall()
+            if path.startswith(root + os.sep) and path not in found
+        ]
+        self._db.executemany('DELETE FROM captures WHERE path = ?',
+                             [(path,) for path in stale])
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = {
+                    executor.submit(summarize_capture, path, data_type,
+                                    sample_rate, **summary_args): path
+                    for path in pending
+                }
+                for future in as_completed(futures):
+                    try:
+                        self._store(future.result())
+                    except Exception as err:  # pylint: disable=W0703
+                        logger.warning('Failed to summarize %s: %s',
+                                       futures[future], str(err))
+        self._db.commit()
+        return len(pending), len(found) - len(pending)
+
+    def query(self,
+              band=None,  # type: Optional[Tuple[float, float]]
+              min_power=None,  # type: Optional[float]
+              min_bursts=None,  # type: Optional[int]
+              ):
+        # type: (...) -> List[CaptureSummary]
+        """Find captures with a band power above `min_power` dB somewhere in
+        the `band` (Hz) and at least `min_bursts` bursts"""
+        results = []
+        for row in self._db.execute('SELECT * FROM captures ORDER BY path'):
+            summary = CaptureSummary(*row)
+            summary = summary._replace(
+                band_power=json.loads(summary.band_power),
+                peaks=json.loads(summary.peaks),
+            )
+            if min_bursts is not None and summary.bursts < min_bursts:
+                continue
+            if min_power is not None:
+                powers = summary.band_power
+                if band is not None:
+                    powers = _powers_in_band(summary, band)
+                if not powers or max(powers) < min_power:
+                    continue
+            results.append(summary)
+        return results
+
+
+def _powers_in_band(summary, band):
+    # type: (CaptureSummary, Tuple[float, float]) -> List[float]
+    """Band powers of a summary overlapping the (low, high) band in Hz"""
+    num_bands = len(summary.band_power)
+    if num_bands == 0:
+        return []
+    width = summary.sample_rate / num_bands
+    low, high = min(band), max(band)
+    powers = []
+    for idx, power in enumerate(summary.band_power):
+        band_low = -summary.sample_rate / 2.0 + idx * width
+        if band_low < high and band_low + width > low:
+            powers.append(power)
+    return powers
+
+
+class FileLoadThread(QThread):
+    """Loads a data source range on a worker thread.
+
+    The range is planned and the capture opened on the thread, `opened` then
+    hands the GUI the buffer that is being filled so plots can be drawn from
+    the prefix reported by `progress` while the rest is read.
+    """
+    opened = pyqtSignal(str, object, int, int, object)
+    progress = pyqtSignal(int)
+    loaded = pyqtSignal()
+    cancelled = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, data_source, path, reset, parent=None,
+                 chunk_size=1 << 23):
+        # type: (DataSource, str, bool, Optional[QWidget], int) -> None
+        QThread.__init__(self, parent)
+        self._data_source = data_source
+        self._path = path
+        self._reset = reset
+        self._chunk_size = chunk_size
+        self._cancel = False
+
+    def cancel(self):
+        # type: () -> None
+        self._cancel = True
+
+    def run(self):
+        try:
+            capture, start, end = self._data_source.plan_load(
+                self._path, self._reset
+            )
+            data_type = self._data_source.load_type(self._path, capture)
+            data = None
+            if self._data_source.fits_budget(start, end, data_type):
+                data = numpy.empty(end - start, data_type)
+            self.opened.emit(self._path, capture, start, end, data)
+            if data is not None:
+                filled = 0
+                for filled in self._data_source.iter_read_range(
+                        capture, start, data, self._chunk_size):
+                    if self._cancel:
+                        self.cancelled.emit(filled)
+                        return
+                    self.progress.emit(filled)
+            self.loaded.emit()
+        except Exception as err:  # pylint: disable=W0703
+            logger.exception('Failed to load %s', self._path)
+            self.failed.emit(str(err))
+
+
+class BurstDetectThread(QThread):
+    """Runs `find_bursts` over a capture on a worker thread"""
+    found = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, data_type, sample_rate, detector_args,
+                 parent=None):
+        # type: (str, str, float, Dict, Optional[QWidget]) -> None
+        QThread.__init__(self, parent)
+        self._path = path
+        self._data_type = data_type
+        self._sample_rate = sample_rate
+        self._detector_args = detector_args
+        self._cancel = False
+
+    def cancel(self):
+        # type: () -> None
+        self._cancel = True
+
+    def run(self):
+        try:
+            bursts = find_bursts(
+                self._path, self._data_type, self._sample_rate,
+                cancelled=lambda: self._cancel, **self._detector_args
+            )
+            if bursts is not None:
+                self.found.emit(bursts)
+        except Exception as err:  # pylint: disable=W0703
+            logger.exception('Failed to detect bursts in %s', self._path)
+            self.failed.emit(str(err))
+
+
+class PlotPrepareThread(QThread):
+    """Computes plot data from a `SampleStream` on a worker thread.
+
+    `compute_f` is called with a watched copy of the stream, `progress`
+    reports thousandths of the range read and a cancelled computation
+    emits nothing.
+    """
+    progress = pyqtSignal(int)
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, key, compute_f, stream, parent=None):
+        # type: (Tuple, Callable, SampleStream, Optional[QWidget]) -> None
+        QThread.__init__(self, parent)
+        self.key = key
+        self._compute_f = compute_f
+        self._stream = stream
+        self._permille = -1
+        self._cancel = False
+
+    def cancel(self):
+        # type: () -> None
+        self._cancel = True
+
+    def _progress(self, done, total):
+        # type: (int, int) -> None
+        permille = 1000 * done // max(1, total)
+        if permille != self._permille:
+            self._permille = permille
+            self.progress.emit(permille)
+
+    def run(self):
+        stream = self._stream.watched(lambda: self._cancel, self._progress)
+        try:
+            result = self._compute_f(stream)
+        except Cancelled:
+            return
+        except Exception as err:  # pylint: disable=W0703
+            logger.exception('Failed to prepare the plot data')
+            self.failed.emit(str(err))
+            return
+        self.done.emit(result)
+
+
 class MainWindow(QMainWindow):
     """Main window that contains the plot widget as well as the setting"""
 
-    def __init__(self, file=None, data_type=None):
-        # type: (str) -> None
+    def __init__(self, file=None, data_type=None, memory_budget=None,
+                 sample_rate=None):
+        # type: (str, str, Optional[int], Optional[float]) -> None
         super().__init__()
         self.setWindowTitle('GNURadio Plotting Utility')
         self.setGeometry(0, 0, 1000, 500)
         self._setup_actions()
         self.statusBar()
         self._add_menu()
-        self._data_source = DataSource(file, data_type)
+        # Budget is in MB, apply it before the file is read
+        self._data_source = DataSource(data_type=data_type)
+        if memory_budget:
+            self._data_source.memory_budget = MemoryBudget(memory_budget << 20)
+        self._loader = None  # type: Optional[FileLoadThread]
+        self._load_data = None  # type: Optional[numpy.ndarray]
+        self._data_source.reload_cb = self._abandon_load
+        self._load_progress_w = QProgressBar()
+        self._load_progress_w.setMaximumWidth(200)
+        self._load_progress_w.hide()
+        self.statusBar().addPermanentWidget(self._load_progress_w)
+        self._prepare_progress_w = QProgressBar()
+        self._prepare_progress_w.setMaximumWidth(200)
+        self._prepare_progress_w.setRange(0, 1000)
+        self._prepare_progress_w.setFormat('Processing %p%')
+        self._prepare_progress_w.hide()
+        self.statusBar().addPermanentWidget(self._prepare_progress_w)
+        # Kept apart from the transient messages so they can not hide it
+        self._fidelity_w = QLabel()
+        self._fidelity_w.hide()
+        self.statusBar().addPermanentWidget(self._fidelity_w)
         # We have not loaded a file yet, so let the file pick the data range
         self._first_file = True
         if file is not None:
@@ -818,8 +3768,14 @@ class MainWindow(QMainWindow):
 
         # The tabs for the plots
         self.plot_widget = PlottingWidget(self, self._data_source)
+        self.plot_widget.fidelity_cb = self._show_fidelity
+        self.plot_widget.prepare_cb = self._show_prepare
+        self.plot_widget.prepare_failed_cb = self._prepare_failed
 
-        self.settings_widget = PlotSettingsWidget(self.plot_widget)
+        self.settings_widget = PlotSettingsWidget(self.plot_widget,
+                                                  memory_budget)
+        if sample_rate:
+            self.settings_widget.set_sample_rate(sample_rate)
 
         layout = QGridLayout()
         layout.addWidget(self.plot_widget, 0, 0, 1, 1)
@@ -834,6 +3790,9 @@ class MainWindow(QMainWindow):
 
         self.show()
 
+        if file is not None:
+            self.load_file(file, True)
+
     def _setup_actions(self):
         # type: () -> None
         self._exit_action = QAction('&Exit', self)
@@ -846,12 +3805,70 @@ class MainWindow(QMainWindow):
         self._open_action.setStatusTip('Open data file')
         self._open_action.triggered.connect(self._open_file)
 
+        self._cancel_action = QAction('&Cancel', self)
+        self._cancel_action.setShortcut('Esc')
+        self._cancel_action.setStatusTip(
+            'Stop loading or processing the data file'
+        )
+        self._cancel_action.setEnabled(False)
+        self._cancel_action.triggered.connect(self._cancel)
+
+        self._export_action = QAction('&Export Selection', self)
+        self._export_action.setShortcut('Ctrl+E')
+        self._export_action.setStatusTip(
+            'Write the selected sample range to a new file'
+        )
+        self._export_action.triggered.connect(self._export_selection)
+
     def _add_menu(self):
         # type: () -> None
         self._menu_bar = self.menuBar()
         file_menu = self._menu_bar.addMenu('&File')
         file_menu.addAction(self._exit_action)
         file_menu.addAction(self._open_action)
+        file_menu.addAction(self._cancel_action)
+        file_menu.addAction(self._export_action)
+
+    def closeEvent(self, event):
+        # Threads parented to the window have to finish before it can be
+        # deleted
+        self.cancel_load()
+        if self._loader is not None:
+            self._loader.wait()
+        self.settings_widget.stop_threads()
+        self.plot_widget.stop_threads()
+        QMainWindow.closeEvent(self, event)
+
+    def _show_fidelity(self, reductions):
+        # type: (str) -> None
+        self._fidelity_w.setText(
+            'Reduced fidelity to fit memory budget: ' + reductions
+        )
+        self._fidelity_w.setVisible(bool(reductions))
+
+    def _show_prepare(self, progress):
+        # type: (Optional[float]) -> None
+        if progress is None:
+            self._prepare_progress_w.hide()
+        else:
+            self._prepare_progress_w.setValue(int(progress * 1000))
+            self._prepare_progress_w.show()
+        self._cancel_action.setEnabled(
+            progress is not None or
+            (self._loader is not None and self._loader.isRunning())
+        )
+
+    def _prepare_failed(self, err):
+        # type: (str) -> None
+        self.statusBar().showMessage('Failed to process data: ' + err)
+
+    def _cancel(self):
+        # type: () -> None
+        """Stop the load and any processing of the range for the plots"""
+        if self.plot_widget.preparing:
+            self.plot_widget.cancel_prepare()
+            self.statusBar().showMessage('Processing cancelled', 5000)
+        self.cancel_load()
 
     def _open_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -860,22 +3877,238 @@ class MainWindow(QMainWindow):
         if not file_path:
             # File was not selected
             return
-        self._data_source.load_file(file_path, self._first_file)
+        self.load_file(file_path, self._first_file)
+
+    def _export_selection(self):
+        data_source = self._data_source
+        if data_source.source_path is None:
+            return
+        stem, ext = export_name(
+            data_source.source_path,
+            isinstance(data_source.capture, CompressedCapture)
+        )
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, 'Export Selection', '{0}_{1}_{2}{3}'.format(
+                stem, data_source.start, data_source.end, ext
+            )
+        )
+        if not file_path:
+            return
+        try:
+            samples = data_source.export(file_path)
+        except Exception as err:  # pylint: disable=W0703
+            logger.exception('Failed to export %s', file_path)
+            self.statusBar().showMessage('Failed to export: ' + str(err))
+            return
+        self.statusBar().showMessage(
+            'Exported {0} samples to {1}'.format(samples, file_path), 5000
+        )
+
+    def load_file(self, path, reset=False):
+        # type: (str, bool) -> None
+        """Load a data file in the background, any load in progress is
+        cancelled"""
+        self.cancel_load()
+        if self._loader is not None:
+            self._loader.wait()
+
+        loader = FileLoadThread(self._data_source, path, reset, self)
+        loader.opened.connect(self._load_opened)
+        loader.progress.connect(self._load_progress)
+        loader.loaded.connect(self._load_done)
+        loader.cancelled.connect(self._load_cancelled)
+        loader.failed.connect(self._load_failed)
+        self._loader = loader
+        self._cancel_action.setEnabled(True)
+        self.statusBar().showMessage('Opening {0}'.format(path))
+        loader.start()
+
+    def cancel_load(self):
+        # type: () -> None
+        if self._loader is not None and self._loader.isRunning():
+            self._loader.cancel()
+
+    def _abandon_load(self):
+        # type: () -> None
+        """A synchronous reload of the source replaces the background load,
+        anything it has queued is dropped by the sender checks"""
+        if self._loader is None:
+            return
+        self._loader.cancel()
+        self._loader.wait()
+        self._loader = None
+        self._load_data = None
+        self._load_finish()
+
+    def _load_opened(self, path, capture, start, end, data):
+        if self.sender() is not self._loader:
+            # Queued from a load that has since been replaced
+            return
+        self._load_data = data
+        initial = None if data is None else data[:0]
+        self._data_source.apply_load(path, capture, start, end, initial)
+        self.settings_widget.source_update()
+        if data is None:
+            # Range is streamed to the plots under the memory budget
+            self.plot_widget.refresh_plot()
+        else:
+            self._load_progress_w.setRange(0, max(1, len(data)))
+            self._load_progress_w.setValue(0)
+            self._load_progress_w.show()
+            self.statusBar().showMessage('Loading {0}'.format(path))
+
+    def _load_progress(self, filled):
+        if self.sender() is not self._loader:
+            # Queued from a load that has since been replaced
+            return
+        first_chunk = len(self._data_source.data) == 0
+        self._data_source.data = self._load_data[:filled]
+        self._load_progress_w.setValue(filled)
+        if first_chunk:
+            self.plot_widget.refresh_plot()
+
+    def _load_done(self):
+        if self.sender() is not self._loader:
+            # Queued from a load that has since been replaced
+            return
+        self._load_finish()
+        if self._load_data is not None:
+            self._data_source.data = self._load_data
+            self.plot_widget.refresh_plot()
+        self._load_data = None
+        self.statusBar().showMessage(
+            'Loaded {0}'.format(self._data_source.source_path), 5000
+        )
+
+    def _load_cancelled(self, filled):
+        if self.sender() is not self._loader:
+            # Queued from a load that has since been replaced
+            return
+        self._load_finish()
+        # Keep what was read, the range is cut down to match
+        data_source = self._data_source
+        data_source.apply_load(
+            data_source.source_path, data_source.capture, data_source.start,
+            data_source.start + filled, self._load_data[:filled]
+        )
+        self._load_data = None
         self.settings_widget.source_update()
         self.plot_widget.refresh_plot()
+        self.statusBar().showMessage(
+            'Load cancelled after {0} samples'.format(filled), 5000
+        )
+
+    def _load_failed(self, err):
+        if self.sender() is not self._loader:
+            # Queued from a load that has since been replaced
+            return
+        self._load_finish()
+        self._load_data = None
+        self.statusBar().showMessage('Failed to load file: ' + err)
+
+    def _load_finish(self):
+        self._load_progress_w.hide()
+        self._cancel_action.setEnabled(self.plot_widget.preparing)
+
+
+def _instance_name():
+    # type: () -> str
+    """Local socket name of the single instance, one per user"""
+    return 'grplot-{0}'.format(getpass.getuser())
+
+
+def send_to_instance(request, timeout=2000):
+    # type: (Dict[str, Any], int) -> bool
+    """Ask a running single instance to open a window for `request`,
+    returns False if there is no instance to take it"""
+    socket = QLocalSocket()
+    socket.connectToServer(_instance_name())
+    if not socket.waitForConnected(timeout):
+        return False
+    socket.write(json.dumps(request).encode('utf-8') + b'\n')
+    socket.waitForBytesWritten(timeout)
+    accepted = (socket.waitForReadyRead(timeout) and
+                bytes(socket.readLine()).strip() == b'ok')
+    socket.disconnectFromServer()
+    return accepted
+
+
+class InstanceServer(QLocalServer):
+    """Takes requests from later `grplot --single_instance` runs.
+
+    Each request is a line of JSON holding the `MainWindow` arguments, it
+    is acknowledged then emitted through `open_requested`.
+    """
+    open_requested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        QLocalServer.__init__(self, parent)
+        # Only the user that started the instance can open windows in it
+        self.setSocketOptions(QLocalServer.UserAccessOption)
+        self.newConnection.connect(self._connection)
+
+    def listen_instance(self, timeout=1000):
+        # type: (int) -> bool
+        name = _instance_name()
+        # Listening replaces any socket already there, so check that no
+        # instance accepts on it first, even one too busy to answer
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(timeout):
+            probe.abort()
+            logger.warning('Another instance is listening on %s', name)
+            return False
+        # An instance that crashed can leave its socket behind
+        QLocalServer.removeServer(name)
+        if not self.listen(name):
+            logger.warning('Unable to listen on %s: %s', name,
+                           self.errorString())
+            return False
+        return True
+
+    def _connection(self):
+        socket = self.nextPendingConnection()
+        socket.readyRead.connect(lambda: self._read(socket))
+        socket.disconnected.connect(socket.deleteLater)
+
+    def _read(self, socket):
+        if not socket.canReadLine():
+            return
+        try:
+            request = json.loads(bytes(socket.readLine()).decode('utf-8'))
+        except ValueError as err:
+            logger.warning('Ignoring bad instance request: %s', str(err))
+            socket.write(b'error\n')
+            return
+        socket.write(b'ok\n')
+        socket.flush()
+        self.open_requested.emit(request)
 
 
 def _exception_handler(*_):
     logger.exception("UI Triggered exception :(")
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option('--file', type=click.Path(exists=True))
 @click.option('--data_type', type=click.Choice(_DATA_TYPES),
               default='complex64')
+@click.option('--memory_budget', type=click.IntRange(min=1), default=None,
+              help='Memory budget in MB, views are reduced to stay within it')
+@click.option('--sample_rate', type=float, default=None)
+@click.option('--single_instance', is_flag=True,
+              help='Open the file in a running grplot started with this flag')
 @click.option('-v', '--verbose', count=True)
-def main(file, data_type, verbose):
-    # type: (str) -> None
+@click.pass_context
+def main(ctx,  # type: click.Context
+         file,  # type: str
+         data_type,  # type: str
+         memory_budget,  # type: Optional[int]
+         sample_rate,  # type: Optional[float]
+         single_instance,  # type: bool
+         verbose,  # type: int
+         ):
+    # type: (...) -> None
     """Main console entry point"""
 
     # setup logger
@@ -892,11 +4125,39 @@ def main(file, data_type, verbose):
     numpy.seterr(divide='raise')
     #pg.exceptionHandling.register(_exception_handler)
 
+    if ctx.invoked_subcommand is not None:
+        return
+
+    request = {
+        'file': None if file is None else os.path.abspath(file),
+        'data_type': data_type,
+        'memory_budget': memory_budget,
+        'sample_rate': sample_rate,
+    }
+    if single_instance and send_to_instance(request):
+        logger.info('Opened in the running instance')
+        return
+
     app = QApplication(sys.argv)
 
-    # Need to prevent the window object form being cleaned up while execution
-    # loop is running
-    _qt_window = MainWindow(file, data_type)
+    # Need to prevent the window objects form being cleaned up while
+    # execution loop is running
+    windows = []  # type: List[MainWindow]
+
+    def open_window(args):
+        window = MainWindow(args.get('file'), args.get('data_type'),
+                            args.get('memory_budget'), args.get('sample_rate'))
+        window.setAttribute(Qt.WA_DeleteOnClose)
+        window.destroyed.connect(lambda: windows.remove(window))
+        window.raise_()
+        window.activateWindow()
+        windows.append(window)
+
+    open_window(request)
+    if single_instance:
+        server = InstanceServer(app)
+        server.open_requested.connect(open_window)
+        server.listen_instance()
 
     try:
         sys.exit(app.exec_())
@@ -904,6 +4165,90 @@ def main(file, data_type, verbose):
         pass
 
 
+@main.command('export')
+@click.argument('file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--range', 'ranges', type=(int, int), multiple=True,
+              required=True, help='Sample range [START, END), repeatable')
+@click.option('--output', default='{stem}_{start}_{end}{ext}',
+              show_default=True,
+              help='Output path, formatted with stem, ext, start and end')
+@click.option('--data_type', type=click.Choice(_DATA_TYPES),
+              default='complex64')
+@click.option('--out_type', type=click.Choice(_DATA_TYPES), default=None,
+              help='Convert the samples, defaults to a straight copy')
+def export(file, ranges, output, data_type, out_type):
+    # type: (str, List[Tuple[int, int]], str, str, Optional[str]) -> None
+    """Write sample ranges of FILE to new files"""
+    metadata = load_metadata(file)
+    if metadata is not None and metadata.data_type is not None:
+        data_type = metadata.data_type
+    if len(ranges) > 1 and '{start' not in output and '{end' not in output:
+        raise click.BadParameter('must include {start} or {end}',
+                                 param_hint='--output')
+    try:
+        written = export_ranges(file, ranges, output, data_type, out_type)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    for out_path in written:
+        click.echo(out_path)
+
+
+@main.group()
+def catalog():
+    """Index directories of captures"""
+
+
+@catalog.command('scan')
+@click.argument('root', type=click.Path(exists=True, file_okay=False))
+@click.option('--index', type=click.Path(dir_okay=False),
+              default='grplot_index.sqlite', show_default=True)
+@click.option('--data_type', type=click.Choice(_DATA_TYPES),
+              default='complex64')
+@click.option('--sample_rate', type=float, default=8000.0)
+@click.option('--pattern', default='*', show_default=True,
+              help='Glob used to select capture files')
+@click.option('--jobs', type=int, default=None,
+              help='Worker processes, defaults to the CPU count')
+def catalog_scan(root, index, data_type, sample_rate, pattern, jobs):
+    # type: (str, str, str, float, str, Optional[int]) -> None
+    """Summarize new or changed captures under ROOT into the index"""
+    capture_catalog = CaptureCatalog(index)
+    try:
+        scanned, skipped = capture_catalog.scan(
+            root, data_type, sample_rate, pattern, jobs
+        )
+    finally:
+        capture_catalog.close()
+    click.echo('Scanned {0} files, {1} unchanged'.format(scanned, skipped))
+
+
+@catalog.command('query')
+@click.option('--index', type=click.Path(exists=True, dir_okay=False),
+              default='grplot_index.sqlite', show_default=True)
+@click.option('--band', type=(float, float), default=None,
+              help='Frequency band (Hz) to test min_power against')
+@click.option('--min_power', type=float, default=None,
+              help='Minimum band power (dB)')
+@click.option('--min_bursts', type=int, default=None)
+def catalog_query(index,  # type: str
+                  band,  # type: Optional[Tuple[float, float]]
+                  min_power,  # type: Optional[float]
+                  min_bursts,  # type: Optional[int]
+                  ):
+    # type: (...) -> None
+    """List indexed captures matching the filters"""
+    capture_catalog = CaptureCatalog(index)
+    try:
+        results = capture_catalog.query(band, min_power, min_bursts)
+    finally:
+        capture_catalog.close()
+    for summary in results:
+        click.echo('{0}\t{1:.3f}s\tbursts={2}\tpeaks={3}'.format(
+            summary.path, summary.duration, summary.bursts,
+            ','.join('{0:.1f}'.format(peak) for peak in summary.peaks)
+        ))
+
+
 if __name__ == '__main__':
     # pylint does not know how to handle parameters that are generated by
     # the decorators PyCQA/pylint/issues/2297
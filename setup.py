@@ -20,11 +20,14 @@ setup(
     platforms='any',
     install_requires=[
         'click>=7.0.0',
-        'numpy>=1.12.0',
+        'numpy>=1.20.0',
         'pyqtgraph>=0.10.0',
         'PyQt5>=5.10',
-        'scipy>=1.0.0',
+        'scipy>=1.4.0',
     ],
+    extras_require={
+        'zstd': ['zstandard'],
+    },
     entry_points={
         'console_scripts': [
             'grplot = grplot:main',
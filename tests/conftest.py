@@ -0,0 +1,18 @@
+import os
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmpdir_factory, monkeypatch):
+    """Keep indexes and other derived data out of the user cache"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir_factory.mktemp('cache')))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """One application for every test that needs Qt, widgets need it to be
+    a QApplication"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,98 @@
+import numpy
+from scipy import signal
+
+import grplot
+from grplot import BurstDetector, burst_range, find_bursts
+
+
+def _capture(length=1 << 16, bursts=((8192, 12288), (40000, 41000))):
+    rng = numpy.random.default_rng(4)
+    data = 0.01 * (rng.standard_normal(length) +
+                   1j * rng.standard_normal(length))
+    tone = numpy.exp(2j * numpy.pi * 0.1 * numpy.arange(length))
+    for start, end in bursts:
+        # Ramped like a real transmitter so the edges do not splatter
+        envelope = signal.windows.tukey(end - start, 0.1)
+        data[start:end] += envelope * tone[start:end]
+    return data.astype(numpy.complex64)
+
+
+def test_detect_bursts():
+    detector = BurstDetector()
+    detector.update(_capture())
+    bursts = detector.bursts()
+    assert bursts.shape == (2, 2)
+    # Edges are resolved to a block plus the moving average
+    numpy.testing.assert_allclose(bursts, [[8192, 12288], [40000, 41000]],
+                                  atol=3 * detector.block_size)
+
+
+def test_chunking_does_not_matter():
+    data = _capture()
+    whole = BurstDetector()
+    whole.update(data)
+    chunked = BurstDetector()
+    for start in range(0, len(data), 1000):
+        chunked.update(data[start:start + 1000])
+    numpy.testing.assert_array_equal(whole.bursts(), chunked.bursts())
+
+
+def test_hysteresis_bridges_dip():
+    data = _capture(bursts=((8192, 16384),))
+    # A 5 dB dip stays above the off threshold
+    data[12000:12800] *= 10 ** (-5 / 20)
+    detector = BurstDetector(threshold=20.0, hysteresis=10.0)
+    detector.update(data)
+    assert len(detector.bursts()) == 1
+    detector = BurstDetector(threshold=20.0, hysteresis=1.0)
+    detector.update(data)
+    assert len(detector.bursts()) == 1
+    data[12000:12800] = 0
+    detector = BurstDetector(threshold=20.0, hysteresis=1.0)
+    detector.update(data)
+    assert len(detector.bursts()) == 2
+
+
+def test_band_energy():
+    data = _capture()
+    # The tone sits at 0.1 of the sample rate
+    detector = BurstDetector(band=(0.05, 0.15), sample_rate=1.0)
+    detector.update(data)
+    assert len(detector.bursts()) == 2
+    detector = BurstDetector(band=(-0.4, -0.2), sample_rate=1.0)
+    detector.update(data)
+    assert len(detector.bursts()) == 0
+
+
+def test_find_bursts_cached(tmpdir, monkeypatch):
+    fn = str(tmpdir.join('bursts.bin'))
+    _capture().tofile(fn)
+    bursts = find_bursts(fn)
+    assert len(bursts) == 2
+
+    # Served from the persisted index without reading the capture
+    grplot._BURST_CACHE.clear()
+    with monkeypatch.context() as patch:
+        patch.setattr(BurstDetector, 'update', None)
+        numpy.testing.assert_array_equal(find_bursts(fn), bursts)
+
+    # A change of settings is detected again
+    assert len(find_bursts(fn, threshold=60.0)) == 0
+
+
+def test_find_bursts_cancelled(tmpdir):
+    fn = str(tmpdir.join('bursts.bin'))
+    _capture().tofile(fn)
+    assert find_bursts(fn, cancelled=lambda: True) is None
+    # Nothing was cached for the cancelled run
+    assert len(find_bursts(fn)) == 2
+
+
+def test_burst_range():
+    assert burst_range(1000, 2000, 256, 10000) == (1000, 2000)
+    # Short bursts are centered in an FFT worth of samples
+    assert burst_range(1000, 1010, 256, 10000) == (877, 1133)
+    # and kept inside the capture
+    assert burst_range(0, 10, 256, 10000) == (0, 256)
+    assert burst_range(9990, 10000, 256, 10000) == (9744, 10000)
+    assert burst_range(0, 10, 256, 100) == (0, 100)
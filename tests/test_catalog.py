@@ -0,0 +1,89 @@
+import os
+
+import pytest
+import numpy
+
+from grplot import CaptureCatalog, summarize_capture
+
+from .test_metadata import header
+
+
+@pytest.fixture
+def capture_dir(tmpdir):
+    """Directory with a noise capture and a noise capture with two bursts"""
+    rng = numpy.random.RandomState(0)
+    noise = (0.01*rng.randn(64*1024)).astype(numpy.complex64)
+    noise.tofile(str(tmpdir.join('noise.bin')))
+
+    bursts = noise.copy()
+    tone = numpy.exp(2j*numpy.pi*0.25*numpy.arange(4096))
+    bursts[8192:8192+4096] += tone
+    bursts[32768:32768+4096] += tone
+    sub_dir = tmpdir.mkdir('sub')
+    bursts.tofile(str(sub_dir.join('bursts.bin')))
+    return tmpdir
+
+
+def test_summary(capture_dir):
+    summary = summarize_capture(
+        str(capture_dir.join('sub', 'bursts.bin')), sample_rate=1000.0,
+        fft_size=256, chunk_size=10000,
+    )
+    assert summary.length == 64*1024
+    assert summary.duration == pytest.approx(64*1024/1000.0)
+    assert len(summary.band_power) == 16
+    assert summary.bursts == 2
+    assert summary.peaks[0] == pytest.approx(250.0, abs=1000.0/256)
+
+
+def test_scan_incremental(capture_dir):
+    index = str(capture_dir.join('index.sqlite'))
+    catalog = CaptureCatalog(index)
+    assert catalog.scan(str(capture_dir), sample_rate=1000.0,
+                        pattern='*.bin', jobs=2, fft_size=256) == (2, 0)
+    assert catalog.scan(str(capture_dir), sample_rate=1000.0,
+                        pattern='*.bin', jobs=2, fft_size=256) == (0, 2)
+
+    os.remove(str(capture_dir.join('noise.bin')))
+    catalog.scan(str(capture_dir), sample_rate=1000.0, pattern='*.bin')
+    assert len(catalog.query()) == 1
+    catalog.close()
+
+
+def test_query(capture_dir):
+    catalog = CaptureCatalog(str(capture_dir.join('index.sqlite')))
+    catalog.scan(str(capture_dir), sample_rate=1000.0, pattern='*.bin',
+                 fft_size=256)
+
+    found = catalog.query(min_bursts=1)
+    assert [os.path.basename(s.path) for s in found] == ['bursts.bin']
+
+    found = catalog.query(band=(200.0, 300.0), min_power=-30.0)
+    assert [os.path.basename(s.path) for s in found] == ['bursts.bin']
+    assert catalog.query(band=(-300.0, -200.0), min_power=-30.0) == []
+    catalog.close()
+
+
+def test_scan_header(capture_dir):
+    """A capture with a detached header is summarized with its type and
+    rate and the header itself is not indexed"""
+    data = (numpy.arange(8000) % 7).astype(numpy.float32)
+    data.tofile(str(capture_dir.join('meta.dat')))
+    with open(str(capture_dir.join('meta.dat.hdr')), 'wb') as fh:
+        fh.write(header(2000.0, 0.0, data.nbytes, item_type=5, cplx=False))
+
+    catalog = CaptureCatalog(str(capture_dir.join('index.sqlite')))
+    assert catalog.scan(str(capture_dir), sample_rate=1000.0,
+                        fft_size=256) == (3, 0)
+    found = {os.path.basename(s.path): s for s in catalog.query()}
+    assert sorted(found) == ['bursts.bin', 'meta.dat', 'noise.bin']
+    assert found['meta.dat'].data_type == 'float32'
+    assert found['meta.dat'].sample_rate == 2000.0
+    assert found['meta.dat'].length == 8000
+    assert found['noise.bin'].data_type == 'complex64'
+    assert found['noise.bin'].sample_rate == 1000.0
+
+    # Settings from the header do not make the capture look stale
+    assert catalog.scan(str(capture_dir), sample_rate=1000.0,
+                        fft_size=256) == (0, 3)
+    catalog.close()
@@ -0,0 +1,131 @@
+import pytest
+import numpy
+from scipy import signal
+
+import grplot
+from grplot import (
+    ChannelFilter, DataSource, MemoryBudget, SampleStream, STFTEngine,
+    preprocess, zoom_psd,
+)
+
+
+def _signal(length):
+    rng = numpy.random.RandomState(1)
+    return (rng.randn(length) + 1j*rng.randn(length)).astype(numpy.complex64)
+
+
+@pytest.mark.parametrize('up,down', [(1, 4), (2, 3), (3, 2), (1, 7)])
+def test_chunked_matches_one_shot(up, down):
+    data = _signal(5000)
+    channel = ChannelFilter(1000.0, up=up, down=down)
+    expected = signal.upfirdn(channel.taps, data, channel.up, channel.down)
+    expected = expected[:channel.output_length(len(data))]
+
+    chunks = [channel.process(chunk)
+              for chunk in numpy.array_split(data, [7, 400, 401, 2999])]
+    numpy.testing.assert_allclose(numpy.concatenate(chunks), expected,
+                                  rtol=1e-4, atol=1e-4)
+
+
+def test_shift_phase_continuous():
+    data = numpy.ones(1000, dtype=numpy.complex64)
+    channel = ChannelFilter(1000.0, shift=100.0)
+    out = numpy.concatenate([channel.process(chunk)
+                             for chunk in numpy.array_split(data, 7)])
+    expected = numpy.exp(-2j*numpy.pi*100.0*numpy.arange(1000)/1000.0)
+    numpy.testing.assert_allclose(out, expected, atol=1e-4)
+
+
+def test_preprocess_channel(tmpdir):
+    fs = 10000.0
+    n = numpy.arange(20000)
+    tone = numpy.exp(2j*numpy.pi*2100.0*n/fs).astype(numpy.complex64)
+    path = str(tmpdir.join('tone.bin'))
+    tone.tofile(path)
+
+    source = DataSource(path)
+    result = preprocess(source, fs, shift=2000.0, down=10, chunk_size=3000)
+    assert result.sample_rate == fs / 10
+    assert len(result.data) == 2000
+    assert result.center == 2000.0
+
+    # The shifted tone is at 100 Hz in the decimated output
+    spectrum = numpy.abs(numpy.fft.fft(result.data[200:1224]))
+    freqs = numpy.fft.fftfreq(1024, 1/result.sample_rate)
+    assert freqs[numpy.argmax(spectrum)] == pytest.approx(100.0, abs=1.0)
+
+    assert preprocess(source, fs, shift=2000.0, down=10) is result
+
+
+def test_zoom_psd_resolves_close_tones():
+    fs = 100000.0
+    n = numpy.arange(400000)
+    # Two tones 20 Hz apart, far below the fs/nfft bin width of ~390 Hz
+    data = (numpy.exp(2j*numpy.pi*10000.0*n/fs) +
+            numpy.exp(2j*numpy.pi*10020.0*n/fs)).astype(numpy.complex64)
+    freqs, psd = zoom_psd(data, fs, (9900.0, 10100.0),
+                          signal.windows.blackman(256))
+    assert freqs[0] >= 9900.0 and freqs[-1] <= 10100.0
+    # Resolution is now fine enough to separate the tones
+    assert freqs[1] - freqs[0] < 5.0
+    peaks, _ = signal.find_peaks(psd, height=psd.max() / 10)
+    numpy.testing.assert_allclose(sorted(freqs[peaks]), [10000.0, 10020.0],
+                                  atol=3.0)
+
+
+def test_preprocess_cache_bytes(tmpdir):
+    path = str(tmpdir.join('noise.bin'))
+    numpy.ones(20000, numpy.complex64).tofile(path)
+    source = DataSource(path)
+    first = preprocess(source, 1000.0, down=2)
+    assert preprocess(source, 1000.0, down=4) is not first
+    assert preprocess(source, 1000.0, down=2) is first
+
+    # Only the latest result fits, the earlier ones are dropped
+    second = preprocess(source, 1000.0, down=4, cache_bytes=80000)
+    assert grplot._PREPROCESS_CACHE.nbytes <= 80000
+    assert len(grplot._PREPROCESS_CACHE) == 1
+    assert preprocess(source, 1000.0, down=4, cache_bytes=80000) is second
+    assert preprocess(source, 1000.0, down=2, cache_bytes=80000) is not first
+
+
+def test_sample_stream(tmpdir):
+    path = str(tmpdir.join('noise.bin'))
+    _signal(20000).tofile(path)
+    in_memory = SampleStream(DataSource(path), 1000.0, shift=100.0, up=2,
+                             down=3)
+    source = DataSource()
+    source.memory_budget = MemoryBudget(1000)
+    source.load_file(path, True)
+    assert source.data is None
+    stream = SampleStream(source, 1000.0, shift=100.0, up=2, down=3,
+                          chunk_size=777)
+    assert stream.key == in_memory.key
+    assert len(stream) == ChannelFilter(1000.0, up=2, down=3).output_length(
+        20000
+    )
+    samples = stream.read()
+    assert len(samples) == len(stream)
+    numpy.testing.assert_allclose(samples, in_memory.read(), atol=1e-5)
+
+    # Streamed FFTs match the ones of the samples held in memory
+    window = signal.windows.hann(128)
+    spec, mean_power = STFTEngine(window, hop=96, block_frames=5).analyze(
+        stream, average=3
+    )
+    expected = STFTEngine(window, hop=96).analyze(samples, average=3)
+    numpy.testing.assert_allclose(spec, expected[0], atol=1e-3)
+    numpy.testing.assert_allclose(mean_power, expected[1], rtol=1e-4)
+
+    persist = STFTEngine(window, hop=96).persistence(stream)
+    expected = STFTEngine(window, hop=96).persistence(samples)
+    numpy.testing.assert_allclose(persist.max_hold, expected.max_hold,
+                                  atol=1e-3)
+    numpy.testing.assert_allclose(persist.db_range, expected.db_range,
+                                  atol=1e-3)
+    assert persist.counts.sum() == expected.counts.sum()
+
+    freqs, psd = zoom_psd(stream, stream.sample_rate, (-50.0, 50.0), window)
+    expected = zoom_psd(samples, stream.sample_rate, (-50.0, 50.0), window)
+    numpy.testing.assert_allclose(freqs, expected[0])
+    numpy.testing.assert_allclose(psd, expected[1], rtol=1e-4)
@@ -0,0 +1,105 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+import numpy
+
+from grplot import CompressedCapture, DataSource, detect_codec
+
+
+_COMPRESSORS = {
+    'gzip': gzip.compress,
+    'xz': lzma.compress,
+    'bz2': bz2.compress,
+}
+
+
+def _write_units(path, data, compress, units):
+    """Write data as `units` independently compressed members"""
+    with open(path, 'wb') as fh:
+        for part in numpy.array_split(data, units):
+            fh.write(compress(part.tobytes()))
+
+
+@pytest.mark.parametrize('codec', sorted(_COMPRESSORS))
+def test_compressed_range(tmpdir, codec):
+    data = numpy.arange(1000, dtype=numpy.complex64)
+    path = str(tmpdir.join('capture.bin'))
+    _write_units(path, data, _COMPRESSORS[codec], 10)
+    assert detect_codec(path) == codec
+
+    ds = DataSource(path)
+    numpy.testing.assert_array_equal(ds.data, data)
+
+    ds.start = 150
+    ds.end = 720
+    numpy.testing.assert_array_equal(ds.data, data[150:720])
+
+    chunks = list(ds.iter_chunks(64))
+    assert max(len(chunk) for chunk in chunks) == 64
+    numpy.testing.assert_array_equal(numpy.concatenate(chunks),
+                                     data[150:720])
+
+
+def test_index_persisted(tmpdir, monkeypatch):
+    data = numpy.arange(1000, dtype=numpy.float32)
+    path = str(tmpdir.join('capture.gz'))
+    _write_units(path, data, gzip.compress, 4)
+
+    capture = CompressedCapture(path, 'gzip')
+    assert capture.size == data.nbytes
+    assert len(capture._decompressed) == 4
+
+    def fail():
+        raise AssertionError('index should not be rebuilt')
+    monkeypatch.setattr(CompressedCapture, '_build_index', fail)
+    capture = CompressedCapture(path, 'gzip')
+    assert capture.size == data.nbytes
+
+
+def test_read_starts_at_covering_unit(tmpdir):
+    data = numpy.arange(1000, dtype=numpy.float32)
+    path = str(tmpdir.join('capture.gz'))
+    _write_units(path, data, gzip.compress, 4)
+
+    capture = CompressedCapture(path, 'gzip')
+    offsets = []
+    iter_units = capture._iter_units
+
+    def tracking(offset):
+        offsets.append(offset)
+        return iter_units(offset)
+    capture._iter_units = tracking
+    buf = capture.read(800*4, 100*4)
+    numpy.testing.assert_array_equal(
+        numpy.frombuffer(buf, numpy.float32), data[800:900]
+    )
+    assert offsets == [capture._compressed[3]]
+
+
+def test_zstd(tmpdir):
+    zstandard = pytest.importorskip('zstandard')
+    data = numpy.arange(1000, dtype=numpy.complex64)
+    path = str(tmpdir.join('capture.zst'))
+    _write_units(path, data, zstandard.ZstdCompressor().compress, 5)
+
+    ds = DataSource(path)
+    ds.start = 10
+    ds.end = 900
+    numpy.testing.assert_array_equal(ds.data, data[10:900])
+
+
+def test_raw_int16_with_gzip_magic(tmpdir):
+    # -29921 is stored as the bytes 1f 8b
+    data = numpy.arange(-500, 504, dtype=numpy.int16)
+    data[:4] = [-29921, 0, -29921, 8]
+    path = str(tmpdir.join('capture.bin'))
+    data[:2].tofile(path)
+    assert detect_codec(path) is None
+    # Matches the full gzip header but does not decode
+    data[2:].tofile(path)
+    assert detect_codec(path) is None
+
+    ds = DataSource(path, data_type='int16')
+    numpy.testing.assert_array_equal(ds.data, data[2:])
@@ -83,3 +83,29 @@ def test_reload(size_100_file):
     ds.data = numpy.array([], dtype=numpy.complex64)
     ds.reload_file()
     numpy.testing.assert_array_equal(ds.data, size_100_file[0])
+
+
+def test_chunked_read_range(size_100_file):
+    ds = DataSource()
+    capture, start, end = ds.plan_load(size_100_file[1], True)
+    assert (start, end) == (0, 100)
+    assert ds.source_path is None
+
+    data = numpy.empty(end - start, dtype=numpy.complex64)
+    progress = list(ds.iter_read_range(capture, start, data, chunk_size=30))
+    assert progress == [30, 60, 90, 100]
+
+    ds.apply_load(size_100_file[1], capture, start, end, data)
+    numpy.testing.assert_array_equal(ds.data, size_100_file[0])
+    assert ds.end == 100
+
+
+def test_reload_cb(size_100_file):
+    ds = DataSource()
+    ds.load_file(size_100_file[1], True)
+    calls = []
+    ds.reload_cb = lambda: calls.append(ds.start)
+    ds.set_range(10, 20)
+    ds.data_type = 'float32'
+    assert calls == [10, 10]
+    assert ds.data.dtype == numpy.float32
@@ -0,0 +1,32 @@
+import numpy
+
+from grplot import density_histogram
+
+
+def test_density_counts_all_samples():
+    data = (numpy.random.randn(1000) +
+            1j*numpy.random.randn(1000)).astype(numpy.complex64)
+    counts, extent = density_histogram(data, bins=32, chunk_size=100)
+    assert counts.shape == (32, 32)
+    assert counts.sum() == 1000
+    assert extent > 0
+
+
+def test_density_matches_histogram2d():
+    data = (numpy.random.randn(500) +
+            1j*numpy.random.randn(500)).astype(numpy.complex64)
+    counts, extent = density_histogram(data, bins=16, extent=4.0,
+                                       chunk_size=64)
+    clipped_i = numpy.clip(data.real, -4.0, 4.0 - 1e-6)
+    clipped_q = numpy.clip(data.imag, -4.0, 4.0 - 1e-6)
+    expected, _, _ = numpy.histogram2d(
+        clipped_i, clipped_q, bins=16, range=[[-4.0, 4.0], [-4.0, 4.0]]
+    )
+    assert extent == 4.0
+    numpy.testing.assert_array_equal(counts, expected)
+
+
+def test_density_zero_data():
+    counts, extent = density_histogram(numpy.zeros(10, numpy.complex64), 8)
+    assert extent == 1.0
+    assert counts[4, 4] == 10
@@ -0,0 +1,110 @@
+import os
+import errno
+import gzip
+
+import pytest
+import numpy
+
+from grplot import DataSource, export_range, export_ranges
+
+
+@pytest.fixture
+def capture(tmpdir):
+    data = (numpy.arange(1000) * (1 + 2j)).astype(numpy.complex64)
+    fn = str(tmpdir.join('capture.bin'))
+    data.tofile(fn)
+    return data, fn
+
+
+def test_copy(capture, tmpdir):
+    data, fn = capture
+    out = str(tmpdir.join('out.bin'))
+    assert export_range(fn, out, 100, 250) == 150
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(out, numpy.complex64), data[100:250]
+    )
+    # The range is clipped to the end of the capture
+    assert export_range(fn, out, 900, 2000) == 100
+
+
+def test_export_over_source(capture, tmpdir):
+    data, fn = capture
+    with pytest.raises(ValueError):
+        export_range(fn, fn, 0, 10)
+    # Also through a link to the capture
+    link = str(tmpdir.join('link.bin'))
+    os.symlink(fn, link)
+    with pytest.raises(ValueError):
+        export_ranges(fn, [(0, 10)], link)
+    numpy.testing.assert_array_equal(numpy.fromfile(fn, numpy.complex64),
+                                     data)
+
+
+def test_copy_fallback(capture, tmpdir, monkeypatch):
+    data, fn = capture
+
+    def cross_device(*_):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+    monkeypatch.setattr(os, 'copy_file_range', cross_device, raising=False)
+    out = str(tmpdir.join('out.bin'))
+    assert export_range(fn, out, 1, 999) == 998
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(out, numpy.complex64), data[1:999]
+    )
+
+
+def test_convert(capture, tmpdir):
+    data, fn = capture
+    out = str(tmpdir.join('out.bin'))
+    export_range(fn, out, 10, 20, out_type='complex128', chunk_size=3)
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(out, numpy.complex128), data[10:20]
+    )
+    with pytest.raises(ValueError):
+        export_range(fn, out, 10, 20, out_type='int16')
+
+
+def test_compressed(capture, tmpdir):
+    data, fn = capture
+    with open(fn, 'rb') as fh:
+        raw = fh.read()
+    gz = str(tmpdir.join('capture.bin.gz'))
+    with open(gz, 'wb') as fh:
+        fh.write(gzip.compress(raw))
+    out = str(tmpdir.join('out.bin'))
+    export_range(gz, out, 500, 600)
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(out, numpy.complex64), data[500:600]
+    )
+
+    # Exports are raw so they are not named after the codec
+    output = str(tmpdir.join('{stem}_{start}_{end}{ext}'))
+    written = export_ranges(gz, [(500, 600)], output)
+    assert os.path.basename(written[0]) == 'capture_500_600.bin'
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(written[0], numpy.complex64), data[500:600]
+    )
+
+
+def test_multiple_ranges(capture, tmpdir):
+    data, fn = capture
+    output = str(tmpdir.join('{stem}_{start}_{end}{ext}'))
+    written = export_ranges(fn, [(0, 10), (20, 40)], output)
+    assert [p.split('/')[-1] for p in written] == [
+        'capture_0_10.bin', 'capture_20_40.bin'
+    ]
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(written[1], numpy.complex64), data[20:40]
+    )
+
+
+def test_source_export(capture, tmpdir):
+    data, fn = capture
+    ds = DataSource()
+    ds.load_file(fn, True)
+    ds.set_range(300, 310)
+    out = str(tmpdir.join('out.bin'))
+    ds.export(out)
+    numpy.testing.assert_array_equal(
+        numpy.fromfile(out, numpy.complex64), ds.data
+    )
@@ -0,0 +1,82 @@
+import os
+import sys
+import socket
+import threading
+import subprocess
+
+import pytest
+from PyQt5.QtCore import QDir
+
+import grplot
+from grplot import InstanceServer, send_to_instance
+
+
+@pytest.fixture
+def app(qapp, monkeypatch):
+    # Keep clear of an instance the user may have running
+    monkeypatch.setattr(grplot, '_instance_name',
+                        lambda: 'grplot-test-{0}'.format(id(monkeypatch)))
+    return qapp
+
+
+def test_no_instance(app):
+    assert not send_to_instance({'file': None}, timeout=100)
+
+
+def test_request_handed_over(app):
+    server = InstanceServer()
+    requests = []
+    server.open_requested.connect(requests.append)
+    assert server.listen_instance()
+
+    request = {'file': '/tmp/capture.bin', 'data_type': 'float32',
+               'memory_budget': None, 'sample_rate': 1e6}
+    result = []
+    client = threading.Thread(
+        target=lambda: result.append(send_to_instance(request))
+    )
+    client.start()
+    while client.is_alive():
+        app.processEvents()
+    client.join()
+    app.processEvents()
+    server.close()
+
+    assert result == [True]
+    assert requests == [request]
+
+
+def test_busy_instance_kept(app):
+    # The running instance never gets to process events while the new one
+    # starts, as when it is busy drawing
+    running = InstanceServer()
+    assert running.listen_instance()
+    server = InstanceServer()
+    assert not server.listen_instance(timeout=100)
+    assert running.isListening()
+    running.close()
+
+
+def test_stale_socket_removed(app):
+    path = os.path.join(QDir.tempPath(), grplot._instance_name())
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    try:
+        server = InstanceServer()
+        assert server.listen_instance(timeout=100)
+        server.close()
+    finally:
+        stale.close()
+
+
+def test_import_defers_heavy_modules():
+    """A hand over to a running instance does not wait for scipy and
+    pyqtgraph to load"""
+    code = ('import sys, grplot; '
+            'print(any(m.startswith(("scipy.signal.", "pyqtgraph.")) '
+            'for m in sys.modules))')
+    out = subprocess.check_output(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert out.strip() == b'False'
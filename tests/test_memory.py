@@ -0,0 +1,126 @@
+import numpy
+
+from grplot import (
+    DataSource, MainWindow, MemoryBudget, PlottingWidget, SampleStream,
+)
+
+
+def test_unlimited_budget():
+    budget = MemoryBudget()
+    assert budget.fits(1 << 40)
+    assert budget.reduction(1 << 40) == 1
+    assert budget.stft_plan(10000, 256, 192) == (51, 1)
+
+
+def test_unlimited_plan_caps_block():
+    block_frames, average = MemoryBudget().stft_plan(1 << 24, 1024, 768)
+    assert average == 1
+    assert block_frames * 1024 * 20 <= 1 << 22
+
+
+def test_reduction():
+    budget = MemoryBudget(1000)
+    assert budget.fits(1000)
+    assert budget.reduction(1000) == 1
+    assert budget.reduction(1001) == 2
+    assert budget.reduction(4500) == 5
+
+
+def test_stft_plan_within_budget():
+    budget = MemoryBudget(1 << 20)
+    block_frames, average = budget.stft_plan(1 << 24, 1024, 768)
+    assert block_frames % average == 0
+    assert (block_frames * 1024 * 40 <= (1 << 20) // 2 or
+            block_frames == average)
+    frames = ((1 << 24) - 1024) // 768 + 1
+    assert -(-frames // average) * 1024 * 5 <= (1 << 20) // 2
+
+
+def test_source_skips_read_over_budget(tmpdir):
+    path = str(tmpdir.join('data.bin'))
+    numpy.arange(1000, dtype=numpy.complex64).tofile(path)
+
+    ds = DataSource()
+    ds.memory_budget = MemoryBudget(1000)
+    ds.load_file(path, True)
+    assert ds.data is None
+    assert ds.end == 1000
+    assert sum(len(chunk) for chunk in ds.iter_chunks(100)) == 1000
+
+    ds.memory_budget.limit = None
+    ds.reload_file()
+    assert len(ds.data) == 1000
+
+
+def _show(qapp, widget, name):
+    widget.tabs.setCurrentIndex(widget.get_plot(name).tab_idx)
+    while widget.preparing:
+        qapp.processEvents()
+
+
+def test_fft_plots_keep_full_bandwidth(qapp, tmpdir):
+    path = str(tmpdir.join('data.bin'))
+    numpy.ones(100000, dtype=numpy.complex64).tofile(path)
+    source = DataSource()
+    source.memory_budget = MemoryBudget(1 << 20)
+    source.load_file(path, True)
+    widget = PlottingWidget(None, source)
+    fidelity = []
+    widget.fidelity_cb = fidelity.append
+
+    data = widget.fft_data()
+    assert isinstance(data.data, SampleStream)
+    assert len(data.data) == 100000
+    assert data.sample_rate == widget.sample_rate
+    _show(qapp, widget, 'spec')
+    assert fidelity[-1] == 'spectrogram frames averaged x2'
+
+    # Only the time and constellation plots are decimated
+    _show(qapp, widget, 'time')
+    assert fidelity[-1] == 'decimated x4'
+    assert len(widget.plot_data().data) == 25000
+
+
+def test_streamed_refresh_on_worker(qapp, tmpdir):
+    path = str(tmpdir.join('data.bin'))
+    numpy.ones(1 << 20, dtype=numpy.complex64).tofile(path)
+    source = DataSource()
+    source.memory_budget = MemoryBudget(1 << 20)
+    source.load_file(path, True)
+    widget = PlottingWidget(None, source)
+    progress = []
+    widget.prepare_cb = progress.append
+
+    # The refresh returns straight away and can be cancelled
+    widget.set_channel(100.0, 1, 2)
+    assert widget.preparing
+    assert progress == [0.0]
+    widget.cancel_prepare()
+    widget.stop_threads()
+    qapp.processEvents()
+    assert not widget.preparing
+    assert progress[-1] is None
+    i_curve, _ = widget.get_iq(widget.get_plot('time').plot)
+    assert i_curve.xData is None
+
+    del progress[:]
+    widget.refresh_plot()
+    while widget.preparing:
+        qapp.processEvents()
+    assert 0.0 < max(p for p in progress if p is not None) <= 1.0
+    assert progress[-1] is None
+    assert len(i_curve.xData) == len(widget.plot_data().data)
+
+
+def test_fidelity_outlasts_load_message(qapp, tmpdir):
+    path = str(tmpdir.join('data.bin'))
+    numpy.ones(1 << 18, dtype=numpy.complex64).tofile(path)
+    window = MainWindow(path, 'complex64', memory_budget=1)
+    while window._loader.isRunning() or window._cancel_action.isEnabled():
+        qapp.processEvents()
+    qapp.processEvents()
+
+    assert window.statusBar().currentMessage().startswith('Loaded')
+    assert window._fidelity_w.isVisibleTo(window)
+    assert window._fidelity_w.text().endswith('decimated x8')
+    window.close()
@@ -0,0 +1,185 @@
+import struct
+
+import pytest
+import numpy
+
+from grplot import CaptureMetadata, DataSource
+
+
+def pmt(value):
+    """Serialize a value the way GNU Radio serializes PMTs"""
+    if value is True:
+        return b'\x00'
+    if value is False:
+        return b'\x01'
+    if isinstance(value, str):
+        raw = value.encode('utf-8')
+        return b'\x02' + struct.pack('>H', len(raw)) + raw
+    if isinstance(value, float):
+        return b'\x04' + struct.pack('>d', value)
+    if isinstance(value, int):
+        return b'\x0b' + struct.pack('>Q', value)
+    if isinstance(value, tuple):
+        return (b'\x0c' + struct.pack('>I', len(value)) +
+                b''.join(pmt(item) for item in value))
+    raise TypeError(value)
+
+
+def pmt_dict(items, tag=b'\x09'):
+    """Items as a chain of (key . value) pairs terminated by null"""
+    out = b''
+    for key, value in items:
+        out += tag + b'\x07' + pmt(key) + pmt(value)
+    return out + b'\x06'
+
+
+# Item sizes GNU Radio writes for each header `type`
+_ITEM_SIZES = {0: 1, 1: 2, 2: 4, 3: 4, 4: 8, 5: 4, 6: 8}
+
+
+def header(rate, rx_time, seg_bytes, extras=b'', item_type=5, cplx=True,
+           tag=b'\x09', size=None, strt=None):
+    if size is None:
+        size = _ITEM_SIZES[item_type] * (2 if cplx else 1)
+
+    def build(strt):
+        return pmt_dict([
+            ('version', 0),
+            ('rx_rate', rate),
+            ('rx_time', (int(rx_time), rx_time - int(rx_time))),
+            ('size', size),
+            ('type', item_type),
+            ('cplx', cplx),
+            ('strt', strt),
+            ('bytes', seg_bytes),
+        ], tag)
+    if strt is None:
+        strt = len(build(0)) + len(extras)
+    return build(strt) + extras
+
+
+@pytest.fixture
+def meta_file(tmpdir):
+    """Three segments of complex64 at 1 kHz with a gap before the last"""
+    data = numpy.arange(3000, dtype=numpy.complex64)
+    fn = tmpdir.join('capture.dat')
+    data.tofile(str(fn))
+    extras = pmt_dict([('freq', 915e6)])
+    hdr = (header(1000.0, 100.0, 8000, extras) +
+           header(1000.0, 101.0, 8000, extras, tag=b'\x07') +
+           header(1000.0, 105.5, 8000, extras))
+    with open(str(fn) + '.hdr', 'wb') as fh:
+        fh.write(hdr)
+    return data, str(fn)
+
+
+def test_parse_segments(meta_file):
+    with open(meta_file[1] + '.hdr', 'rb') as fh:
+        metadata = CaptureMetadata.parse(fh.read())
+    assert metadata.data_type == 'complex64'
+    assert metadata.sample_rate == 1000.0
+    assert metadata.extras == {'freq': 915e6}
+    assert [seg.sample for seg in metadata.segments] == [0, 1000, 2000]
+    assert metadata.segment_at(101.2) == 1
+    assert metadata.sample_at(101.25) == 1250
+    # In the gap between segments and before the first segment
+    assert metadata.sample_at(103.0) == 1999
+    assert metadata.sample_at(99.0) == 0
+
+
+def test_truncated_header(meta_file):
+    with open(meta_file[1] + '.hdr', 'rb') as fh:
+        buf = fh.read()
+    metadata = CaptureMetadata.parse(buf[:-20])
+    assert len(metadata.segments) == 2
+
+
+def test_unsupported_item_type():
+    metadata = CaptureMetadata.parse(header(10.0, 0.0, 40, item_type=1))
+    assert metadata.data_type is None
+    metadata = CaptureMetadata.parse(
+        header(10.0, 0.0, 80, item_type=6, cplx=False)
+    )
+    assert metadata.data_type == 'float64'
+    assert metadata.segments[0].samples == 10
+
+
+def test_item_sizes():
+    # GNU Radio longs are 4 bytes
+    metadata = CaptureMetadata.parse(
+        header(10.0, 0.0, 40, item_type=3, cplx=False) +
+        header(10.0, 2.0, 40, item_type=3, cplx=False)
+    )
+    assert metadata.data_type == 'int32'
+    assert [seg.sample for seg in metadata.segments] == [0, 10]
+
+    # Vectors of 4 floats per item count as samples
+    metadata = CaptureMetadata.parse(
+        header(10.0, 0.0, 160, item_type=5, cplx=False, size=16) +
+        header(10.0, 5.0, 160, item_type=5, cplx=False, size=16)
+    )
+    assert metadata.data_type == 'float32'
+    assert [seg.sample for seg in metadata.segments] == [0, 40]
+
+    # A size that can not hold the type
+    metadata = CaptureMetadata.parse(header(10.0, 0.0, 60, size=6))
+    assert metadata.data_type is None
+    assert metadata.segments[0].samples == 10
+
+
+def test_corrupt_data_start():
+    buf = header(10.0, 0.0, 80) + header(10.0, 1.0, 80, strt=0)
+    metadata = CaptureMetadata.parse(buf)
+    assert len(metadata.segments) == 1
+
+
+def test_header_parsed_once(meta_file, monkeypatch):
+    data, path = meta_file
+    parses = []
+    parse = CaptureMetadata.parse.__func__
+    monkeypatch.setattr(CaptureMetadata, 'parse', classmethod(
+        lambda cls, buf: parses.append(1) or parse(cls, buf)
+    ))
+    ds = DataSource()
+    ds.load_file(path, True)
+    ds.set_range(0, 100)
+    ds.seek_time(101.0)
+    ds.seek_segment(2)
+    assert len(parses) == 1
+
+
+def test_source_uses_header(meta_file):
+    data, path = meta_file
+    ds = DataSource(data_type='int8')
+    ds.load_file(path, True)
+    assert ds.data_type == numpy.complex64
+    assert ds.sample_rate == 1000.0
+    assert ds.end == 3000
+
+    # An explicit type change sticks on reload
+    ds.data_type = 'float32'
+    assert ds.data.dtype == numpy.float32
+
+
+def test_seek(meta_file):
+    data, path = meta_file
+    ds = DataSource()
+    ds.load_file(path, True)
+    ds.set_range(0, 100)
+    ds.seek_time(105.6)
+    assert (ds.start, ds.end) == (2100, 2200)
+    numpy.testing.assert_array_equal(ds.data, data[2100:2200])
+
+    ds.seek_segment(1, 10)
+    assert (ds.start, ds.end) == (1000, 1010)
+
+
+def test_no_header(tmpdir):
+    fn = tmpdir.join('plain.bin')
+    numpy.zeros(10, numpy.complex64).tofile(str(fn))
+    ds = DataSource()
+    ds.load_file(str(fn), True)
+    assert ds.metadata is None
+    assert ds.sample_rate is None
+    with pytest.raises(ValueError):
+        ds.seek_time(0.0)
@@ -0,0 +1,153 @@
+import tracemalloc
+
+import pytest
+import numpy
+from scipy import signal
+
+import grplot
+from grplot import STFTEngine, quantize, sample_levels
+
+
+def _data(length=5000):
+    rng = numpy.random.RandomState(2)
+    return (rng.randn(length) + 1j*rng.randn(length)).astype(numpy.complex64)
+
+
+def test_matches_scipy_spectrogram():
+    data = _data()
+    window = signal.windows.blackman(256)
+    _, _, expected = signal.spectrogram(
+        data, fs=1000.0, window=window, nfft=256, noverlap=64,
+        scaling='spectrum', return_onesided=False,
+    )
+    expected = numpy.fft.fftshift(10.0*numpy.log10(expected), axes=0).T
+
+    engine = STFTEngine(window, hop=192, block_frames=7)
+    spec = engine.spectrogram(data, engine.spectrum_scale())
+    assert spec.dtype == numpy.float32
+    numpy.testing.assert_allclose(spec, expected, atol=1e-3)
+
+
+def test_density_scale_matches_welch():
+    data = _data()
+    window = signal.windows.hann(128)
+    _, expected = signal.welch(data, fs=1000.0, window=window, noverlap=32,
+                               scaling='density', return_onesided=False)
+    engine = STFTEngine(window, hop=96)
+    total = numpy.zeros(128)
+    for _, power in engine.iter_power(data):
+        total += power.sum(axis=0)
+    psd = total / engine.num_frames(len(data)) * engine.density_scale(1000.0)
+    numpy.testing.assert_allclose(psd, expected, rtol=1e-4)
+
+
+def test_average_and_floor():
+    data = numpy.zeros(1024, dtype=numpy.complex64)
+    engine = STFTEngine(numpy.ones(64), hop=64, block_frames=5)
+    spec = engine.spectrogram(data, average=3, floor=1e-10)
+    assert spec.shape == (6, 64)
+    numpy.testing.assert_allclose(spec, -100.0)
+
+
+def test_buffers_reused():
+    engine = STFTEngine(numpy.hanning(64), hop=32)
+    first = engine.spectrogram(_data(2048))
+    second = engine.spectrogram(_data(2048))
+    assert first is second
+
+
+def test_block_growth_on_same_engine():
+    engine = STFTEngine(numpy.hanning(64), hop=32, block_frames=4)
+    engine.spectrogram(_data(512))
+    engine.block_frames = 100
+    grown = engine.spectrogram(_data(8192)).copy()
+    fresh = STFTEngine(numpy.hanning(64), hop=32).spectrogram(_data(8192))
+    numpy.testing.assert_allclose(grown, fresh, rtol=1e-5)
+
+
+def test_short_input():
+    engine = STFTEngine(numpy.hanning(64))
+    with pytest.raises(ValueError):
+        engine.spectrogram(_data(10))
+
+
+def test_persistence_one_pass():
+    fs = 1000.0
+    n = numpy.arange(8192)
+    data = (numpy.exp(2j*numpy.pi*125.0*n/fs) +
+            0.01*_data(8192)).astype(numpy.complex64)
+    engine = STFTEngine(signal.windows.hann(128), hop=96, block_frames=5)
+    counts, max_hold, min_hold, db_range = engine.persistence(
+        data, engine.density_scale(fs), db_bins=64
+    )
+    frames = engine.num_frames(len(data))
+    assert counts.shape == (128, 64)
+    # Every frame lands in exactly one power bin per frequency bin
+    numpy.testing.assert_array_equal(counts.sum(axis=1), frames)
+    assert numpy.all(max_hold >= min_hold)
+    assert db_range[0] < db_range[1]
+
+    _, expected = signal.welch(data, fs=fs, window=signal.windows.hann(128),
+                               noverlap=32, return_onesided=False)
+    peak = numpy.argmax(numpy.fft.fftshift(expected))
+    assert numpy.argmax(max_hold) == peak
+
+
+def test_persistence_memory_does_not_grow():
+    peaks = []
+    for length in (1 << 18, 1 << 21):
+        data = _data(length)
+        engine = STFTEngine(numpy.hanning(256), block_frames=8192)
+        tracemalloc.start()
+        engine.persistence(data, db_range=(-60.0, 40.0))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < 1.1 * peaks[0]
+    assert peaks[1] < 2 * grplot._STFT_BLOCK_BYTES
+
+
+def test_analyze_mean_is_welch():
+    data = _data()
+    window = signal.windows.blackman(256)
+    _, expected = signal.welch(data, fs=1000.0, window=window, noverlap=64,
+                               scaling='density', return_onesided=False)
+    engine = STFTEngine(window, hop=192, block_frames=6)
+    spec, mean_power = engine.analyze(data, engine.spectrum_scale(),
+                                      average=4)
+    assert spec.shape == (-(-engine.num_frames(len(data)) // 4), 256)
+    numpy.testing.assert_allclose(
+        mean_power * engine.density_scale(1000.0),
+        numpy.fft.fftshift(expected), rtol=1e-4
+    )
+
+
+def test_sampled_levels_and_quantize():
+    rng = numpy.random.default_rng(3)
+    image = rng.uniform(-100.0, -20.0, (500, 256)).astype(numpy.float32)
+    low, high = sample_levels(image, (0.0, 100.0), samples=4096)
+    assert -100.0 <= low < -99.0
+    assert -21.0 < high <= -20.0
+
+    quantized = quantize(image, (-100.0, -20.0), rows=7)
+    assert quantized.dtype == numpy.uint8
+    expected = numpy.rint((image + 100.0) * (255 / 80.0))
+    numpy.testing.assert_allclose(quantized, expected, atol=1)
+    # Values outside the levels are clipped
+    quantized = quantize(image, (-60.0, -50.0))
+    assert quantized.min() == 0 and quantized.max() == 255
+
+    flat = numpy.full((4, 4), -30.0)
+    assert sample_levels(flat) == (-30.0, -29.0)
+    assert quantize(flat, (-40.0, -20.0), numpy.uint16).max() == 32768
+
+
+def test_chunked_input_matches_array():
+    data = _data()
+    engine = STFTEngine(signal.windows.hann(128), hop=96, block_frames=5)
+    expected = engine.analyze(data, average=3)[1]
+    # Chunks shorter than a frame are carried into the next one
+    chunks = numpy.array_split(data, [7, 100, 101, 2999])
+    numpy.testing.assert_allclose(engine.mean_power(iter(chunks)), expected,
+                                  rtol=1e-5)
+    with pytest.raises(ValueError):
+        engine.mean_power(iter(numpy.array_split(data[:127], 3)))